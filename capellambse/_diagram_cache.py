@@ -27,6 +27,7 @@ BAD_FILENAMES = frozenset(
     | {f"LPT{i}" for i in range(1, 10)}
 )
 LOGGER = logging.getLogger(__name__)
+MANIFEST_VERSION = 1
 VALID_IMG_FMTS = frozenset(
     {
         "bmp",
@@ -41,7 +42,6 @@ VALID_IMG_FMTS = frozenset(
 class DiagramCache:
     _cli_cmd: list[str] = []
     _cli_type: t.Literal["exe", "docker"] | None = None
-    _index: list[dict[str, str | bool]] = []
 
     def __init__(
         self,
@@ -52,6 +52,9 @@ class DiagramCache:
         capella_project_name: str,
         diagrams_dir: pathlib.Path,
         diagrams: list[capellambse.model.diagram.Diagram],
+        fingerprints: dict[str, str] | None = None,
+        *,
+        incremental: bool = False,
     ):
         self.capella_cli = capella_cli
         self.image_format = image_format
@@ -60,9 +63,55 @@ class DiagramCache:
         self.capella_project_name = capella_project_name
         self.diagrams_dir = diagrams_dir
         self.diagrams = diagrams
+        self.fingerprints = fingerprints or {}
+        self._index: list[dict[str, str | bool]] = []
         self._json_index_path = self.diagrams_dir / "index.json"
+        self._manifest_path = self.diagrams_dir / "manifest.json"
         self._process_config()
 
+        previous = self._read_manifest() if incremental else {}
+        self.outdated: frozenset[str] = frozenset(
+            diag.uuid
+            for diag in self.diagrams
+            if self._is_outdated(diag.uuid, previous.get(diag.uuid))
+        )
+        self._successful = {
+            uuid
+            for uuid, entry in previous.items()
+            if uuid not in self.outdated and entry["success"]
+        }
+
+    def _read_manifest(self) -> dict[str, dict[str, t.Any]]:
+        """Read the diagram fingerprints from a previous export."""
+        try:
+            manifest = json.loads(self._manifest_path.read_text("utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Ignoring unreadable diagram manifest: %s", err)
+            return {}
+
+        if not isinstance(manifest, dict) or (
+            manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("image_format") != self.image_format
+            or manifest.get("capella_cli") != self.capella_cli
+        ):
+            LOGGER.debug("Diagram manifest is outdated, ignoring it")
+            return {}
+        return manifest.get("diagrams", {})
+
+    def _is_outdated(self, uuid: str, entry: dict[str, t.Any] | None) -> bool:
+        if entry is None or uuid not in self.fingerprints:
+            return True
+        if entry.get("fingerprint") != self.fingerprints[uuid]:
+            return True
+        if entry.get("success"):
+            return not self._image_path(uuid).is_file()
+        return False
+
+    def _image_path(self, uuid: str) -> pathlib.Path:
+        return self.diagrams_dir / f"{uuid}.{self.image_format}"
+
     def _find_exe(self, path: str) -> str | None:
         fpath, _ = os.path.split(path)
         if fpath:
@@ -156,7 +205,7 @@ class DiagramCache:
             fname = f"_{fname}"
         return fname
 
-    def _rename_diagram_image_files(self) -> None:
+    def _rename_diagram_image_files(self, directory: pathlib.Path) -> None:
         """Rename diagram image files so that the UUID is the base name."""
         existing_diagrams: list[dict[str, str | bool]] = [
             d for d in self._index if d["success"]
@@ -166,12 +215,11 @@ class DiagramCache:
             filename = self._diagram_2_image_file_name(
                 f"{filename}.{self.image_format}"
             )
-            old_path = self.diagrams_dir / filename
+            old_path = directory / filename
             if not old_path.is_file():
                 continue
             old_path.rename(
-                self.diagrams_dir
-                / f"{diagram_info['uuid']}.{self.image_format}"
+                directory / f"{diagram_info['uuid']}.{self.image_format}"
             )
 
     def _build_cli_cmd_exe(
@@ -199,7 +247,7 @@ class DiagramCache:
             "/model/main_model",
         ] + self._cli_common_flags
 
-    def _create_index_json(self) -> None:
+    def _create_index_json(self, directory: pathlib.Path | None) -> None:
         """Create a diagram name to UUID index file if not already existing.
 
         Diagram names in Capella are not unique. When there are multiple
@@ -215,6 +263,13 @@ class DiagramCache:
         Luckily the order of the diagrams that are read by the exporter
         matches the order of diagrams we get from
         :meth:`capellambse.model.MelodyModel.diagrams`.
+
+        Parameters
+        ----------
+        directory
+            The directory containing the freshly exported images, or
+            ``None`` if nothing was exported. Diagrams that are not
+            :attr:`outdated` are looked up in the diagram cache instead.
         """
         diagram_names: dict[str, str] = {}  # uuid -> diag.name
         diagram_name_to_uuid_map: dict[str, str] = {}  # uuid -> diagram name
@@ -234,16 +289,17 @@ class DiagramCache:
                 ] = diag.uuid
             else:
                 diagram_name_to_uuid_map[f"{diag.name}"] = diag.uuid
+        self._index = []
         for diagram_name, uuid in sorted(diagram_name_to_uuid_map.items()):
-            filename: str = self._diagram_2_image_file_name(
-                f"{diagram_name}.{self.image_format}"
-            )
+            if directory is None or uuid not in self.outdated:
+                success = uuid in self._successful
+            else:
+                filename: str = self._diagram_2_image_file_name(
+                    f"{diagram_name}.{self.image_format}"
+                )
+                success = directory.joinpath(filename).is_file()
             self._index.append(
-                {
-                    "name": diagram_name,
-                    "uuid": uuid,
-                    "success": self.diagrams_dir.joinpath(filename).is_file(),
-                }
+                {"name": diagram_name, "uuid": uuid, "success": success}
             )
 
     def _create_index_html_file(self) -> None:
@@ -306,6 +362,12 @@ class DiagramCache:
         path.write_bytes(ET.tostring(tree, pretty_print=True))
 
     def export_diagrams(self, project_dir: pathlib.Path) -> None:
+        """Export the :attr:`outdated` diagrams into the cache.
+
+        Capella always exports all representations of the model. The
+        images of diagrams that are still up to date are discarded, so
+        that only the changed diagrams are replaced and post-processed.
+        """
         with tempfile.TemporaryDirectory() as workspace:
             build_cli_cmd = getattr(self, f"_build_cli_cmd_{self._cli_type}")
             build_cli_cmd(project_dir, workspace)
@@ -313,15 +375,62 @@ class DiagramCache:
                 subprocess.check_call(self._cli_cmd)
             except subprocess.CalledProcessError as err:
                 raise RuntimeError("Failed to update diagram cache") from err
+
+            staging = pathlib.Path(workspace, "images")
+            staging.mkdir()
             for p in pathlib.Path(project_dir).glob(
                 f"main_model/**/*.{self.image_format}"
             ):
-                shutil.copyfile(p, self.diagrams_dir / p.name)
-        self._create_index_json()
-        self._rename_diagram_image_files()
-        if self.image_format == "svg":
-            for svg in pathlib.Path(self.diagrams_dir).glob("*.svg"):
-                self._post_process_svg(svg)
+                shutil.copyfile(p, staging / p.name)
+            self._create_index_json(staging)
+            self._rename_diagram_image_files(staging)
+
+            self.diagrams_dir.mkdir(parents=True, exist_ok=True)
+            for diagram_info in self._index:
+                uuid = str(diagram_info["uuid"])
+                if uuid not in self.outdated:
+                    continue
+                target = self._image_path(uuid)
+                if not diagram_info["success"]:
+                    target.unlink(missing_ok=True)
+                    continue
+                shutil.move(staging / target.name, target)
+                if self.image_format == "svg":
+                    self._post_process_svg(target)
+                self._successful.add(uuid)
+        self.finish()
+
+    def finish(self) -> None:
+        """Write the manifest and indices, and remove stale images.
+
+        This is called by :meth:`export_diagrams`, and should be called
+        directly instead if there are no :attr:`outdated` diagrams.
+        """
+        if not self._index:
+            self._create_index_json(None)
+
+        current = {d.uuid for d in self.diagrams}
+        manifest = self._read_manifest()
+        for uuid in manifest.keys() - current:
+            self._image_path(uuid).unlink(missing_ok=True)
+
+        self.diagrams_dir.mkdir(parents=True, exist_ok=True)
+        manifest_data = {
+            "version": MANIFEST_VERSION,
+            "image_format": self.image_format,
+            "capella_cli": self.capella_cli,
+            "diagrams": {
+                str(d["uuid"]): {
+                    "fingerprint": self.fingerprints.get(str(d["uuid"])),
+                    "success": d["success"],
+                }
+                for d in self._index
+            },
+        }
+        self._manifest_path.write_text(
+            json.dumps(manifest_data, indent=2), encoding="utf-8"
+        )
+
         if self.create_index:
             self._json_index_path.write_text(json.dumps(self._index, indent=2))
             self._create_index_html_file()
@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: Copyright DB Netz AG and the capellambse contributors
+# SPDX-License-Identifier: Apache-2.0
+"""A persistent, content-addressed cache for rendered diagrams."""
+from __future__ import annotations
+
+__all__ = ["RenderCache", "diagram_fingerprint", "diagram_key"]
+
+import hashlib
+import logging
+import os
+import pathlib
+import typing as t
+
+import markupsafe
+from lxml import etree
+
+import capellambse
+from capellambse import aird, loader
+from capellambse.loader import core
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_SIZE = 256 * 1024**2
+RENDER_CACHE_VERSION = 2
+
+_KINDS: dict[bytes, t.Callable[[bytes], t.Any]] = {
+    b"b": bytes,
+    b"s": lambda data: data.decode("utf-8"),
+    b"m": lambda data: markupsafe.Markup(data.decode("utf-8")),
+}
+
+
+class RenderCache:
+    """A size-bounded on-disk cache for rendered diagrams.
+
+    Entries are stored as individual files in a local directory, which
+    can be shared between processes and models. Once the files grow
+    beyond ``max_size`` bytes in total, the least recently used entries
+    are removed.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.max_size = max_size
+        self.__size: int | None = None
+
+    def get(self, key: str) -> t.Any:
+        """Get the cached rendering for ``key``.
+
+        Raises
+        ------
+        KeyError
+            If there is no entry for the key.
+        """
+        cachefile = self.path / f"{key}.bin"
+        try:
+            data = cachefile.read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        except OSError as err:
+            LOGGER.warning("Cannot read render cache %s: %s", cachefile, err)
+            raise KeyError(key) from None
+
+        try:
+            decode = _KINDS[data[:1]]
+            value = decode(data[1:])
+        except (KeyError, UnicodeDecodeError):
+            LOGGER.warning("Ignoring bad render cache entry %s", cachefile)
+            raise KeyError(key) from None
+
+        try:
+            os.utime(cachefile)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: t.Any) -> None:
+        """Store a rendered diagram in the cache.
+
+        Only values of type :class:`bytes` and :class:`str` (including
+        :class:`markupsafe.Markup`) can be stored, others are ignored.
+        """
+        if isinstance(value, bytes):
+            data = b"b" + value
+        elif isinstance(value, markupsafe.Markup):
+            data = b"m" + value.encode("utf-8")
+        elif isinstance(value, str):
+            data = b"s" + value.encode("utf-8")
+        else:
+            return
+
+        cachefile = self.path / f"{key}.bin"
+        tmpfile = cachefile.with_name(f"{cachefile.name}.{os.getpid()}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmpfile.write_bytes(data)
+            tmpfile.replace(cachefile)
+        except OSError as err:
+            LOGGER.warning("Cannot write render cache %s: %s", cachefile, err)
+            tmpfile.unlink(missing_ok=True)
+            return
+
+        if self.__size is None:
+            self.__size = sum(i.stat().st_size for i in self.__entries())
+        else:
+            self.__size += len(data)
+        if self.__size > self.max_size:
+            self.__evict()
+
+    def __entries(self) -> list[os.DirEntry]:
+        try:
+            with os.scandir(self.path) as it:
+                return [i for i in it if i.name.endswith(".bin")]
+        except FileNotFoundError:
+            return []
+
+    def __evict(self) -> None:
+        entries: list[tuple[float, int, os.DirEntry]] = []
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort(key=lambda i: i[0])
+
+        size = sum(i[1] for i in entries)
+        for _, entry_size, entry in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        LOGGER.debug("Render cache evicted down to %d bytes", size)
+        self.__size = size
+
+
+def diagram_key(
+    model: loader.MelodyLoader,
+    descriptor: aird.DiagramDescriptor,
+    fmt: str,
+    params: dict[str, t.Any],
+) -> str:
+    """Calculate the render cache key for a diagram.
+
+    The key covers the diagram's contents (see
+    :func:`diagram_fingerprint`), the render parameters and output
+    format, and the capellambse version.
+    """
+    digest = hashlib.sha256()
+    _update(
+        digest,
+        str(RENDER_CACHE_VERSION),
+        capellambse.__version__,
+        fmt,
+        repr(sorted(params.items())),
+    )
+    _update_with_contents(digest, model, descriptor)
+    return digest.hexdigest()
+
+
+def diagram_fingerprint(
+    model: loader.MelodyLoader, descriptor: aird.DiagramDescriptor
+) -> str:
+    """Calculate a fingerprint of a diagram's contents.
+
+    The fingerprint covers the diagram's representation in the ``.aird``
+    file, as well as the semantic elements it shows, including their
+    children and the attributes of all elements that are linked to from
+    anywhere within them. It changes whenever one of these changes.
+    """
+    digest = hashlib.sha256()
+    _update_with_contents(digest, model, descriptor)
+    return digest.hexdigest()
+
+
+def _update(digest: t.Any, *parts: str | bytes) -> None:
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(b"%d\0" % len(part))
+        digest.update(part)
+
+
+def _update_with_contents(
+    digest: t.Any,
+    model: loader.MelodyLoader,
+    descriptor: aird.DiagramDescriptor,
+) -> None:
+    dgtree = model.follow_link(
+        model.trees[descriptor.fragment].root, descriptor.uid
+    )
+    _update(
+        digest,
+        etree.tostring(descriptor.descriptor),
+        etree.tostring(dgtree),
+    )
+
+    hrefs = dict.fromkeys(
+        i.get("href") for i in dgtree.iter("target", "semanticElements")
+    )
+    semantic: dict[etree._Element, None] = {}
+    for href in hrefs:
+        if not href:
+            continue
+        _update(digest, href)
+        try:
+            semantic[model[href]] = None
+        except (KeyError, ValueError):
+            pass
+
+    for elm in semantic:
+        if any(i in semantic for i in elm.iterancestors()):
+            continue
+        _update(digest, etree.tostring(elm))
+        for child in elm.iter():
+            for value in child.attrib.values():
+                for target in core.RE_LINK_TARGET.findall(value):
+                    try:
+                        linked = model[target]
+                    except (KeyError, ValueError):
+                        continue
+                    _update(
+                        digest, target, repr(sorted(linked.attrib.items()))
+                    )
@@ -573,17 +573,19 @@ def req_relation_factory(seb: C.SemanticElementBuilder) -> diagram.Edge:
                 "Requirement-Relation %r has no RelationType",
                 seb.data_element.attrib[C.ATT_XMID],
             )
-        finally:
-            seb.melodyobjs[0].attrib["name"] = label
 
-    return generic_factory(seb)
+    edge = generic_factory(seb)
+    if edge.labels:
+        edge.labels[0].label = label
+    return edge
 
 
 def include_extend_factory(seb: C.SemanticElementBuilder) -> diagram.Edge:
     """Create an AbstractCapabilityIncludes or -Extends edge."""
-    if seb.melodyobjs[0].get("name") is None:
-        seb.melodyobjs[0].attrib["name"] = seb.diag_element.get("name", "")
-    return generic_factory(seb)
+    edge = generic_factory(seb)
+    if seb.melodyobjs[0].get("name") is None and edge.labels:
+        edge.labels[0].label = seb.diag_element.get("name", "")
+    return edge
 
 
 def association_factory(seb: C.SemanticElementBuilder) -> diagram.Edge:
@@ -67,10 +67,15 @@ def load(file: FileOrPath) -> list[dict[str, t.Any]]:
         ctx = open(file, encoding="utf-8")
 
     with ctx as opened_file:
-        return yaml.load(opened_file, Loader=YDMLoader)
+        return yaml.load(opened_file, Loader=_FastYDMLoader)
 
 
-def apply(model: capellambse.MelodyModel, file: FileOrPath) -> None:
+def apply(
+    model: capellambse.MelodyModel,
+    file: FileOrPath,
+    *,
+    transactional: bool = False,
+) -> None:
     """Apply a declarative modelling file to the given model.
 
     Parameters
@@ -84,14 +89,27 @@ def apply(model: capellambse.MelodyModel, file: FileOrPath) -> None:
         The full format of these files is documented in the
         :ref:`section about declarative modelling
         <declarative-modelling>`.
+    transactional
+        Apply all instructions in a single transaction (see
+        :meth:`~capellambse.loader.core.MelodyLoader.transaction`). All
+        ``!uuid`` references are resolved up front, and if an exception
+        occurs, the model is rolled back to the state it had before.
+        This needs to keep a copy of the model in memory while
+        applying.
 
     Notes
     -----
-    This function is not transactional: If an exception occurs during
-    this function, the model will be left partially modified, with no
-    reliable way to know how much of the YAML input has been consumed.
-    It is therefore advised to reload or discard the model immediately
-    in these cases, to avoid working with an inconsistent state.
+    Unless ``transactional`` is set, this function is not
+    transactional: If an exception occurs during this function, the
+    model will be left partially modified, with no reliable way to know
+    how much of the YAML input has been consumed. It is therefore
+    advised to reload or discard the model immediately in these cases,
+    to avoid working with an inconsistent state.
+
+    In transactional mode, the rollback restores the affected fragments
+    from a copy. Model objects from these fragments that were obtained
+    before calling this function are no longer valid after a rollback,
+    and need to be looked up again.
 
     Even though the YAML layout suggests linear execution from top to
     bottom, the actual order in which modifications are executed is
@@ -100,6 +118,19 @@ def apply(model: capellambse.MelodyModel, file: FileOrPath) -> None:
     are used in an input document.
     """
     instructions = collections.deque(load(file))
+    if not transactional:
+        _apply(model, instructions)
+        return
+
+    _resolve_uuids(model, instructions, {})
+    with model._loader.transaction():
+        _apply(model, instructions)
+
+
+def _apply(
+    model: capellambse.MelodyModel,
+    instructions: collections.deque[dict[str, t.Any]],
+) -> None:
     promises = dict[Promise, capellambse.ModelObject]()
     deferred = collections.defaultdict[Promise, list[_FutureAction]](list)
 
@@ -130,6 +161,33 @@ def apply(model: capellambse.MelodyModel, file: FileOrPath) -> None:
         raise UnfulfilledPromisesError(frozenset(deferred))
 
 
+def _resolve_uuids(
+    model: capellambse.MelodyModel,
+    value: t.Any,
+    cache: dict[str, capellambse.ModelObject | None],
+) -> t.Any:
+    """Replace references to existing objects with the objects.
+
+    References to objects that do not exist (yet) are left alone.
+    """
+    if isinstance(value, UUIDReference):
+        try:
+            obj = cache[value.uuid]
+        except KeyError:
+            try:
+                obj = cache[value.uuid] = model.by_uuid(value.uuid)
+            except KeyError:
+                obj = cache[value.uuid] = None
+        return value if obj is None else obj
+    elif isinstance(value, (list, collections.deque)):
+        for i, v in enumerate(value):
+            value[i] = _resolve_uuids(model, v, cache)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            value[k] = _resolve_uuids(model, v, cache)
+    return value
+
+
 def _operate_create(
     promises: dict[Promise, capellambse.ModelObject],
     parent: capellambse.ModelObject,
@@ -180,11 +238,13 @@ def _operate_delete(
         for obj in objs:
             if isinstance(obj, UUIDReference):
                 obj = obj.uuid
+            elif isinstance(obj, common.GenericElement):
+                obj = obj.uuid
             if not isinstance(obj, str):
                 raise TypeError("Values in `delete:*:` must be UUIDs")
             try:
                 idx = uuids.index(obj)
-            except IndexError:
+            except ValueError:
                 puuid = getattr(parent, "uuid", None)
                 raise ValueError(
                     f"No object with UUID {obj!r} in {attr!r} of {puuid!r}"
@@ -409,6 +469,24 @@ class YDMLoader(yaml.SafeLoader):
 YDMLoader.add_constructor("!promise", YDMLoader.construct_promise)
 YDMLoader.add_constructor("!uuid", YDMLoader.construct_uuidref)
 
+if yaml.__with_libyaml__:
+
+    class _FastYDMLoader(yaml.cyaml.CParser, YDMLoader):
+        """A :class:`YDMLoader` that uses libyaml for parsing.
+
+        Constructors and resolvers are looked up on the
+        :class:`YDMLoader`, including ones that are added to it later.
+        """
+
+        def __init__(self, stream: t.Any) -> None:
+            # pylint: disable=non-parent-init-called
+            yaml.cyaml.CParser.__init__(self, stream)
+            yaml.constructor.SafeConstructor.__init__(self)
+            yaml.resolver.Resolver.__init__(self)
+
+else:
+    _FastYDMLoader = YDMLoader  # type: ignore[misc]
+
 
 try:
     import click
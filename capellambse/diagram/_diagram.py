@@ -15,6 +15,7 @@ __all__ = [
     "StyleOverrides",
 ]
 
+import collections
 import collections.abc as cabc
 import enum
 import logging
@@ -893,6 +894,8 @@ class Diagram:
 
         self.viewport = None
         self.__elements: list[DiagramElement] = []
+        self.__uuidindex: dict[str, DiagramElement] = {}
+        self.__spatialindex: _SpatialIndex | None = None
 
         if elements is not None:
             for element in elements:
@@ -925,9 +928,10 @@ class Diagram:
             instead.
         """
         if element.uuid is not None:
-            if element.uuid in self:
+            existing = self.__uuidindex.get(element.uuid)
+            if existing is not None:
                 if force:
-                    old_hidden = self[element.uuid].hidden
+                    old_hidden = existing.hidden
                     new_hidden = element.hidden
                     if new_hidden:
                         LOGGER.warning("Skipping hidden duplicate %s", element)
@@ -937,18 +941,20 @@ class Diagram:
                         return
                     LOGGER.warning(
                         "Overwriting hidden duplicate %r with %r",
-                        str(self[element.uuid]),
+                        str(existing),
                         str(element),
                     )
-                    self.__elements.remove(self[element.uuid])
+                    self.__elements.remove(existing)
                 else:
                     raise ValueError(
                         f"Duplicate element UUID {element.uuid!r}"
                     )
+            self.__uuidindex[element.uuid] = element
 
         if extend_viewport:
             self.__extend_viewport(element.bounds)
         self.__elements.append(element)
+        self.__spatialindex = None
 
     def calculate_viewport(self) -> None:
         """Recalculate the viewport so that all elements are contained."""
@@ -1000,6 +1006,43 @@ class Diagram:
 
         for element in [self.viewport, *self.__elements]:
             element.move(offsetvec, children=False)
+        self.__spatialindex = None
+
+    def crop(self, region: Box) -> Diagram:
+        """Create a copy of this diagram that only shows a region.
+
+        The copy contains all elements whose bounding box intersects
+        with the ``region``, as well as their parent boxes, and uses the
+        region as its viewport. The elements themselves are shared with
+        this diagram.
+
+        Elements are looked up through a spatial index, which is built
+        on first use and discarded when elements are added or the
+        viewport is normalized. After moving or resizing elements in
+        any other way, call :meth:`invalidate_spatial_index`.
+        """
+        if self.__spatialindex is None:
+            self.__spatialindex = _SpatialIndex(self.__elements)
+
+        parents = self.__spatialindex.parents
+        indices = self.__spatialindex.query(region)
+        for i in list(indices):
+            parent = parents[i]
+            while parent is not None and parent not in indices:
+                indices.add(parent)
+                parent = parents[parent]
+
+        cropped = Diagram(
+            self.name, uuid=self.uuid, styleclass=self.styleclass
+        )
+        for i in sorted(indices):
+            cropped.add_element(self.__elements[i], False)
+        cropped.viewport = Box(region.pos, region.size, styleclass="Viewport")
+        return cropped
+
+    def invalidate_spatial_index(self) -> None:
+        """Discard the spatial index used by :meth:`crop`."""
+        self.__spatialindex = None
 
     def __extend_viewport(self, element: DiagramElement) -> None:
         """Extend the viewport so the given element fits in.
@@ -1038,10 +1081,12 @@ class Diagram:
             return self.__elements[key]
 
         if isinstance(key, str):  # lookup by uuid
-            for elm in self.__elements:
-                if elm.uuid == key:
-                    return elm
-            raise KeyError(f"No element with uuid {key!r} in this diagram")
+            try:
+                return self.__uuidindex[key]
+            except KeyError:
+                raise KeyError(
+                    f"No element with uuid {key!r} in this diagram"
+                ) from None
 
         raise TypeError(f"Cannot look up elements by {type(key).__name__!s}")
 
@@ -1050,12 +1095,9 @@ class Diagram:
 
     def __contains__(self, obj: str | DiagramElement) -> bool:
         if isinstance(obj, str):
-            try:
-                self[obj]
-            except KeyError:
-                return False
-            else:
-                return True
+            return obj in self.__uuidindex
+        elif obj.uuid is not None and self.__uuidindex.get(obj.uuid) is obj:
+            return True
         else:
             return obj in self.__elements
 
@@ -1088,3 +1130,78 @@ class Diagram:
     def __iadd__(self, element: DiagramElement) -> Diagram:
         self.add_element(element)
         return self
+
+
+class _SpatialIndex:
+    """A uniform grid over the bounding boxes of diagram elements.
+
+    It also records the index of each element's parent, if the parent is
+    part of the same diagram.
+    """
+
+    CELL_SIZE = 256
+
+    def __init__(self, elements: cabc.Sequence[DiagramElement]) -> None:
+        self.bounds: list[tuple[float, float, float, float]] = []
+        self.cells: collections.defaultdict[tuple[int, int], list[int]]
+        self.cells = collections.defaultdict(list)
+        for i, elm in enumerate(elements):
+            bounds = elm.bounds
+            rect = (
+                bounds.pos.x,
+                bounds.pos.y,
+                bounds.pos.x + bounds.size.x,
+                bounds.pos.y + bounds.size.y,
+            )
+            self.bounds.append(rect)
+            for cell in self.__cells(*rect):
+                self.cells[cell].append(i)
+
+        positions = {id(elm): i for i, elm in enumerate(elements)}
+        self.parents: list[int | None] = [
+            positions.get(id(getattr(elm, "parent", None))) for elm in elements
+        ]
+
+        if self.bounds:
+            self.extent = (
+                min(i[0] for i in self.bounds),
+                min(i[1] for i in self.bounds),
+                max(i[2] for i in self.bounds),
+                max(i[3] for i in self.bounds),
+            )
+
+    def query(self, region: Box) -> set[int]:
+        """Return the indices of all elements that intersect ``region``."""
+        if not self.bounds:
+            return set()
+
+        # Don't scan the empty cells of regions that exceed the diagram
+        minx = max(region.pos.x, self.extent[0])
+        miny = max(region.pos.y, self.extent[1])
+        maxx = min(region.pos.x + region.size.x, self.extent[2])
+        maxy = min(region.pos.y + region.size.y, self.extent[3])
+        found: set[int] = set()
+        for cell in self.__cells(minx, miny, maxx, maxy):
+            for i in self.cells.get(cell, ()):
+                if i in found:
+                    continue
+                eminx, eminy, emaxx, emaxy = self.bounds[i]
+                if (
+                    eminx <= maxx
+                    and minx <= emaxx
+                    and eminy <= maxy
+                    and miny <= emaxy
+                ):
+                    found.add(i)
+        return found
+
+    @staticmethod
+    def __cells(
+        minx: float, miny: float, maxx: float, maxy: float
+    ) -> cabc.Iterator[tuple[int, int]]:
+        size = _SpatialIndex.CELL_SIZE
+        for x in range(math.floor(minx / size), math.floor(maxx / size) + 1):
+            for y in range(
+                math.floor(miny / size), math.floor(maxy / size) + 1
+            ):
+                yield x, y
@@ -18,6 +18,26 @@ _CSSStyle = t.Union[diagram.RGB, t.Iterable[t.Union[diagram.RGB, str]], str]
 class DiagramJSONEncoder(json.JSONEncoder):
     """JSON encoder that knows how to handle AIRD diagrams."""
 
+    def as_json_data(self, o: object) -> t.Any:
+        """Convert ``o`` into plain JSON-compatible Python objects.
+
+        The result is the same as ``json.loads(self.encode(o))``, but
+        without the round trip through a JSON string.
+        """
+        if o is None or type(o) in (str, int, float, bool):
+            return o
+        if isinstance(o, dict):
+            return {str(k): self.as_json_data(v) for k, v in o.items()}
+        if isinstance(o, (list, tuple)):
+            return [self.as_json_data(i) for i in o]
+        if isinstance(o, str):
+            return str(o)
+        if isinstance(o, int):
+            return bool(o) if isinstance(o, bool) else int(o)
+        if isinstance(o, float):
+            return float(o)
+        return self.as_json_data(self.default(o))
+
     def default(self, o: object) -> object:
         if isinstance(o, diagram.Diagram):
             return self.__encode_diagram(o)
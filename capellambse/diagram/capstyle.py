@@ -6,6 +6,7 @@ from __future__ import annotations
 
 __all__ = ["COLORS", "CSSdef", "STYLES", "RGB", "get_style"]
 
+import functools
 import logging
 import typing as t
 
@@ -145,6 +146,11 @@ def get_style(diagramclass: str | None, objectclass: str) -> dict[str, t.Any]:
     if "symbol" in objectclass.lower():
         return {}
 
+    try:
+        return _RESOLVED_STYLES[diagramclass, objectclass].copy()
+    except KeyError:
+        pass
+
     if (
         objectclass not in STYLES["__GLOBAL__"]
         and diagramclass
@@ -160,7 +166,60 @@ def get_style(diagramclass: str | None, objectclass: str) -> dict[str, t.Any]:
 
     if diagramclass:
         retval.update(STYLES.get(diagramclass, {}).get(objectclass, {}))
-    return retval
+    _RESOLVED_STYLES[diagramclass, objectclass] = retval
+    return retval.copy()
+
+
+_RESOLVED_STYLES: dict[tuple[str | None, str], dict[str, t.Any]] = {}
+"""The styles resolved by :func:`get_style`.
+
+This cache is cleared whenever :data:`STYLES` is modified.
+"""
+
+
+def _invalidating(method: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+    @functools.wraps(method)
+    def wrapper(*args: t.Any, **kw: t.Any) -> t.Any:
+        _RESOLVED_STYLES.clear()
+        return method(*args, **kw)
+
+    return wrapper
+
+
+class _StyleTable(t.Dict[str, t.Any]):
+    """A dict that clears the resolved styles when it is modified.
+
+    Nested dicts are converted when they are stored, so that changes on
+    any level of :data:`STYLES` are noticed.
+    """
+
+    def __init__(self, *args: t.Any, **kw: t.Any) -> None:
+        super().__init__()
+        self.update(*args, **kw)
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        _RESOLVED_STYLES.clear()
+        if isinstance(value, dict) and not isinstance(value, _StyleTable):
+            value = _StyleTable(value)
+        super().__setitem__(key, value)
+
+    def __ior__(self, other: t.Any) -> _StyleTable:  # type: ignore[override]
+        self.update(other)
+        return self
+
+    def setdefault(self, key: str, default: t.Any = None) -> t.Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: t.Any, **kw: t.Any) -> None:
+        for key, value in dict(*args, **kw).items():
+            self[key] = value
+
+    __delitem__ = _invalidating(dict.__delitem__)
+    clear = _invalidating(dict.clear)
+    pop = _invalidating(dict.pop)
+    popitem = _invalidating(dict.popitem)
 
 
 #: This dict maps the color names used by Capella to RGB tuples.
@@ -873,3 +932,4 @@ STYLES: dict[str, dict[str, dict[str, CSSdef]]] = {
         },
     },
 }
+STYLES = _StyleTable(STYLES)
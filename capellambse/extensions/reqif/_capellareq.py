@@ -150,8 +150,11 @@ class RequirementsRelationAccessor(
         if obj._constructed:
             sys.audit("capellambse.setattr", obj, self.__name__, value)
 
+        loader = obj._model._loader
         for i in self._find_relations(obj):
+            loader.mark_dirty(i)
             i.getparent().remove(i)
+        loader.mark_dirty(obj._element)
         obj._element.extend(value)
 
     def __delete__(self, obj) -> None:
@@ -162,6 +165,7 @@ class RequirementsRelationAccessor(
         for i in self._find_relations(obj):
             parent = i.getparent()
             assert parent is not None
+            obj._model._loader.mark_dirty(parent)
             parent.remove(i)
 
     def _find_relations(self, obj) -> list[etree._Element]:
@@ -143,6 +143,26 @@ class FileHandler(metaclass=abc.ABCMeta):
             :meth:`write_transaction()` first.
         """
 
+    def prefetch(
+        self, filenames: cabc.Iterable[str | pathlib.PurePosixPath]
+    ) -> None:
+        """Announce that the given files are going to be read soon.
+
+        File handlers that can fetch several files more efficiently at
+        once than one by one may use this as a hint to do so. Files that
+        cannot be prefetched, for example because they don't exist, are
+        silently skipped; errors are reported by :meth:`open()` instead.
+
+        The default implementation does nothing.
+
+        Parameters
+        ----------
+        filenames
+            The names of the files, relative to the ``path`` that was
+            given to the constructor.
+        """
+        del filenames
+
     def write_transaction(
         self, **kw: t.Any
     ) -> t.ContextManager[cabc.Mapping[str, t.Any]]:
@@ -24,6 +24,7 @@ import shutil
 import subprocess
 import tempfile
 import textwrap
+import threading
 import typing as t
 import urllib.parse
 import weakref
@@ -54,6 +55,129 @@ class _TreeEntry(t.NamedTuple):
         return f"{self.mode} {self.type} {self.object}\t{self.file}"
 
 
+class _BatchProcess:
+    """A long-running git process that answers requests on its stdin.
+
+    Requests are serialized with a lock, so that the process can be
+    shared between threads.
+    """
+
+    def __init__(
+        self,
+        *cmd: str,
+        cwd: os.PathLike | str,
+        env: cabc.Mapping[str, str],
+    ) -> None:
+        LOGGER.debug("Starting batch process %s", cmd)
+        self.lock = threading.Lock()
+        self.process = subprocess.Popen(
+            ["git", *cmd],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+            env=env,
+        )
+        self.__fnz = weakref.finalize(self, self.__stop, self.process)
+
+    def close(self) -> None:
+        self.__fnz()
+
+    def request(self, payload: bytes) -> t.BinaryIO:
+        """Send a request and return the stream to read the answer from.
+
+        This method must be called with :attr:`lock` held.
+        """
+        assert self.process.stdin is not None
+        assert self.process.stdout is not None
+        self.process.stdin.write(payload)
+        self.process.stdin.flush()
+        return t.cast(t.BinaryIO, self.process.stdout)
+
+    @staticmethod
+    def __stop(process: subprocess.Popen) -> None:
+        assert process.stdin is not None
+        assert process.stdout is not None
+        process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+class _CatFileBatch(_BatchProcess):
+    """Read blobs through a persistent ``git cat-file --batch``."""
+
+    def __init__(
+        self, *, cwd: os.PathLike | str, env: cabc.Mapping[str, str]
+    ) -> None:
+        super().__init__("cat-file", "--batch", cwd=cwd, env=env)
+
+    def read(self, name: str) -> bytes | None:
+        """Read the named blob, or return None if it does not exist."""
+        with self.lock:
+            stdout = self.request(
+                name.encode("utf-8", errors="surrogateescape") + b"\n"
+            )
+            header = stdout.readline()
+            if not header:
+                raise RuntimeError("git cat-file exited unexpectedly")
+            content = _read_batch_object(header, stdout)
+        return content
+
+
+class _CheckAttrBatch(_BatchProcess):
+    """Query one attribute through a persistent ``git check-attr``."""
+
+    def __init__(
+        self,
+        attribute: str,
+        *,
+        cwd: os.PathLike | str,
+        env: cabc.Mapping[str, str],
+    ) -> None:
+        super().__init__(
+            "check-attr",
+            "--stdin",
+            "-z",
+            "--cached",
+            attribute,
+            cwd=cwd,
+            env=env,
+        )
+
+    def query(self, path: pathlib.PurePosixPath) -> bytes:
+        """Return the value of the attribute for the given path."""
+        with self.lock:
+            stdout = self.request(
+                str(path).encode("utf-8", errors="surrogateescape") + b"\0"
+            )
+            answer = b""
+            while answer.count(b"\0") < 3:
+                chunk = stdout.read1()  # type: ignore[attr-defined]
+                if not chunk:
+                    raise RuntimeError("git check-attr exited unexpectedly")
+                answer += chunk
+        return answer.split(b"\0")[2]
+
+
+def _read_batch_object(header: bytes, stream: t.BinaryIO) -> bytes | None:
+    """Read one object following a ``cat-file --batch`` header line.
+
+    Returns None if the object is missing or not a blob.
+    """
+    if header.endswith((b" missing\n", b" ambiguous\n")):
+        return None
+    _, objtype, size = header.split()
+    content = stream.read(int(size))
+    stream.read(1)  # Skip the terminating LF
+    if objtype != b"blob":
+        return None
+    return content
+
+
 class _ProcessWriter(t.BinaryIO):
     def __init__(
         self,
@@ -310,6 +434,7 @@ class _GitTransaction:
         finally:
             del self.__old_sha
             self.__handler._transaction = None
+            self.__handler._close_batch_processes()
             self.__outer_context.__exit__(exc_type, exc_value, exc_trace)
         return None
 
@@ -505,6 +630,10 @@ class GitFileHandler(FileHandler):
     __has_lfs: bool
     __lfsfiles: dict[pathlib.PurePosixPath, bool]
     __repo: pathlib.Path
+    __batch_lock: threading.Lock
+    __catfile: _CatFileBatch | None
+    __checkattr: _CheckAttrBatch | None
+    __prefetched: dict[pathlib.PurePosixPath, bytes]
 
     def __init__(
         self,
@@ -545,6 +674,10 @@ class GitFileHandler(FileHandler):
             LOGGER.debug("LFS support detected")
             self.__has_lfs = True
         self.__lfsfiles = {}
+        self.__catfile = None
+        self.__checkattr = None
+        self.__batch_lock = threading.Lock()
+        self.__prefetched = {}
 
     def open(
         self,
@@ -562,7 +695,94 @@ class GitFileHandler(FileHandler):
             return self.__open_writable(path)
         return self.__open_readable(path)
 
+    def prefetch(
+        self, filenames: cabc.Iterable[str | pathlib.PurePosixPath]
+    ) -> None:
+        """Read the given files from the repository in bulk.
+
+        The Git attributes and contents of all given files are queried
+        with a single ``git check-attr`` and ``git cat-file`` call each.
+        The contents are kept in memory until the file is opened.
+        Missing files and Git-LFS files are skipped here; they are
+        handled by :meth:`open` as usual.
+        """
+        paths = [
+            capellambse.helpers.normalize_pure_path(i, base=self.subdir)
+            for i in filenames
+        ]
+        paths = [
+            i
+            for i in dict.fromkeys(paths)
+            if i not in self.__prefetched and "\n" not in str(i)
+        ]
+        if not paths:
+            return
+        LOGGER.debug("Prefetching %d files", len(paths))
+
+        unknown = [i for i in paths if i not in self.__lfsfiles]
+        if unknown:
+            attrs = self._git(
+                "check-attr",
+                "--stdin",
+                "-z",
+                "--cached",
+                "filter",
+                input=b"".join(
+                    str(i).encode("utf-8", errors="surrogateescape") + b"\0"
+                    for i in unknown
+                ),
+            )
+            for path, _, value in capellambse.helpers.ntuples(
+                3, attrs.split(b"\0")
+            ):
+                path = pathlib.PurePosixPath(
+                    path.decode("utf-8", errors="surrogateescape")
+                )
+                if value != b"lfs":
+                    self.__lfsfiles[path] = False
+
+        paths = [i for i in paths if self.__lfsfiles.get(i) is False]
+        if not paths:
+            return
+        output = io.BytesIO(
+            self._git(
+                "cat-file",
+                "--batch",
+                input=b"".join(
+                    f"{self.revision}:{i}\n".encode(
+                        "utf-8", errors="surrogateescape"
+                    )
+                    for i in paths
+                ),
+            )
+        )
+        for path in paths:
+            content = _read_batch_object(
+                output.readline(), t.cast(t.BinaryIO, output)
+            )
+            if content is not None:
+                self.__prefetched[path] = content
+
+    def _close_batch_processes(self) -> None:
+        """Stop the long-running git processes and drop prefetched data.
+
+        They are restarted on demand. This is needed after a transaction
+        moved the revision, so that no outdated contents are served.
+        """
+        with self.__batch_lock:
+            if self.__catfile is not None:
+                self.__catfile.close()
+                self.__catfile = None
+            if self.__checkattr is not None:
+                self.__checkattr.close()
+                self.__checkattr = None
+            self.__prefetched.clear()
+
     def __open_readable(self, path: pathlib.PurePosixPath) -> t.BinaryIO:
+        content = self.__prefetched.pop(path, None)
+        if content is not None:
+            return io.BytesIO(content)
+
         try:
             if self.__is_lfs(path):
                 content = self.__open_from_lfs(path)
@@ -773,13 +993,13 @@ class GitFileHandler(FileHandler):
         except KeyError:
             pass
 
-        attrs = self._git("check-attr", "--all", "--cached", "-z", "--", path)
-        for _, attr, value in capellambse.helpers.ntuples(
-            3, attrs.split(b"\0")
-        ):
-            if attr == b"filter" and value == b"lfs":
-                break
-        else:
+        with self.__batch_lock:
+            if self.__checkattr is None:
+                self.__checkattr = _CheckAttrBatch(
+                    "filter", cwd=self.cache_dir, env=self.__get_git_env()
+                )
+            checkattr = self.__checkattr
+        if checkattr.query(path) != b"lfs":
             self.__lfsfiles[path] = False
             return False
 
@@ -791,7 +1011,21 @@ class GitFileHandler(FileHandler):
         return True
 
     def __open_from_index(self, filename: pathlib.PurePosixPath) -> bytes:
-        return self._git("cat-file", "blob", f"{self.revision}:{filename}")
+        if "\n" in str(filename):
+            return self._git("cat-file", "blob", f"{self.revision}:{filename}")
+
+        with self.__batch_lock:
+            if self.__catfile is None:
+                self.__catfile = _CatFileBatch(
+                    cwd=self.cache_dir, env=self.__get_git_env()
+                )
+            catfile = self.__catfile
+        content = catfile.read(f"{self.revision}:{filename}")
+        if content is None:
+            raise FileNotFoundError(
+                f"File not found in revision {self.revision}: {filename}"
+            )
+        return content
 
     def __open_from_lfs(self, filename: pathlib.PurePosixPath) -> bytes:
         lfsinfo = self.__open_from_index(filename)
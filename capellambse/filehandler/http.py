@@ -11,19 +11,28 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import concurrent.futures as cf
+import hashlib
+import io
 import itertools
+import json
+import logging
 import os
 import pathlib
 import re
+import threading
 import typing as t
 import urllib.parse
 
 import requests
+import requests.adapters
 
 from capellambse import helpers, loader
 
 from . import FileHandler
 
+LOGGER = logging.getLogger(__name__)
+
 
 class DownloadStream(t.BinaryIO):
     __stream: cabc.Iterator[bytes]
@@ -93,6 +102,8 @@ class HTTPFileHandler(FileHandler):
             | None
         ) = None,
         subdir: str | pathlib.PurePosixPath = "/",
+        max_connections: int = 8,
+        cache_dir: str | os.PathLike | None = None,
     ) -> None:
         """Connect to a remote server through HTTP or HTTPS.
 
@@ -144,6 +155,16 @@ class HTTPFileHandler(FileHandler):
         subdir
             Prepend this path to all requested files. It is subject to
             the same file name escaping rules explained above.
+        max_connections
+            The maximum number of connections to keep open to the
+            server. This also limits the number of concurrent downloads
+            started by :meth:`prefetch`.
+        cache_dir
+            A directory to store downloaded files in, along with their
+            ``ETag`` and ``Last-Modified`` headers. Files found there
+            are revalidated with a conditional request, and are only
+            downloaded again if the server reports a change. If not
+            given, files are always downloaded.
         """
         if not isinstance(path, str):
             raise TypeError(
@@ -160,10 +181,21 @@ class HTTPFileHandler(FileHandler):
 
         super().__init__(path, subdir=subdir)
 
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+
         self.session = requests.Session()
         self.session.headers.update(headers or {})
         if username and password:
             self.session.auth = (username, password)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_connections, pool_maxsize=max_connections
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.max_connections = max_connections
+        self.cache_dir = pathlib.Path(cache_dir) if cache_dir else None
+        self.__prefetched: dict[str, bytes] = {}
 
     def get_model_info(self) -> loader.ModelInfo:
         assert isinstance(self.path, str)
@@ -180,6 +212,49 @@ class HTTPFileHandler(FileHandler):
     ) -> t.BinaryIO:
         if "w" in mode:
             raise NotImplementedError("Cannot upload to HTTP(S) locations")
+        url = self.__url(filename)
+        content = self.__prefetched.pop(url, None)
+        if content is not None:
+            return io.BytesIO(content)
+        if self.cache_dir is not None:
+            return io.BytesIO(self.__fetch(url))
+        return DownloadStream(  # type: ignore[abstract] # false-positive
+            self.session, url
+        )
+
+    def prefetch(
+        self, filenames: cabc.Iterable[str | pathlib.PurePosixPath]
+    ) -> None:
+        """Download the given files concurrently.
+
+        Up to ``max_connections`` files are downloaded at the same time,
+        and kept in memory until they are opened. Files that cannot be
+        downloaded are skipped; the error will be raised when they are
+        opened.
+        """
+        urls = [
+            i
+            for i in dict.fromkeys(self.__url(i) for i in filenames)
+            if i not in self.__prefetched
+        ]
+        if not urls:
+            return
+
+        LOGGER.debug("Prefetching %d files", len(urls))
+        with cf.ThreadPoolExecutor(
+            max_workers=min(self.max_connections, len(urls)),
+            thread_name_prefix="capellambse-http",
+        ) as pool:
+            futures = {pool.submit(self.__fetch, i): i for i in urls}
+            for future in cf.as_completed(futures):
+                try:
+                    self.__prefetched[futures[future]] = future.result()
+                except (OSError, requests.RequestException) as err:
+                    LOGGER.debug(
+                        "Cannot prefetch %s: %s", futures[future], err
+                    )
+
+    def __url(self, filename: str | pathlib.PurePosixPath) -> str:
         assert isinstance(self.path, str)
         fname = self.subdir / helpers.normalize_pure_path(filename)
         fname_str = str(fname).lstrip("/")
@@ -189,9 +264,61 @@ class HTTPFileHandler(FileHandler):
         }
         url = re.sub("%[sq]", lambda m: replace[m.group(0)], self.path)
         assert url != self.path
-        return DownloadStream(  # type: ignore[abstract] # false-positive
-            self.session, url
+        return url
+
+    def __fetch(self, url: str) -> bytes:
+        """Download ``url``, revalidating a cached copy if possible."""
+        cached: dict[str, str] = {}
+        if self.cache_dir is not None:
+            key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+            datafile = self.cache_dir / f"{key}.data"
+            metafile = self.cache_dir / f"{key}.json"
+            try:
+                cached = json.loads(metafile.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cached = {}
+
+        headers: dict[str, str] = {}
+        if "etag" in cached:
+            headers["If-None-Match"] = cached["etag"]
+        if "last_modified" in cached:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            try:
+                return datafile.read_bytes()
+            except OSError:
+                LOGGER.debug("Cached copy vanished, refetching %s", url)
+                response = self.session.get(url)
+        if response.status_code == 404:
+            raise FileNotFoundError(url)
+        response.raise_for_status()
+        content = response.content
+
+        if self.cache_dir is not None:
+            meta = {"url": url}
+            if etag := response.headers.get("ETag"):
+                meta["etag"] = etag
+            if last_modified := response.headers.get("Last-Modified"):
+                meta["last_modified"] = last_modified
+            if len(meta) > 1:
+                self.__store(datafile, content)
+                self.__store(metafile, json.dumps(meta).encode("utf-8"))
+        return content
+
+    @staticmethod
+    def __store(path: pathlib.Path, content: bytes) -> None:
+        tmpfile = path.with_name(
+            f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
         )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmpfile.write_bytes(content)
+            tmpfile.replace(path)
+        except OSError as err:
+            LOGGER.warning("Cannot write cache file %s: %s", path, err)
+            tmpfile.unlink(missing_ok=True)
 
     def write_transaction(self, **kw: t.Any) -> t.NoReturn:
         raise NotImplementedError(
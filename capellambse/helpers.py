@@ -129,7 +129,7 @@ def load_font(fonttype: str, size: int) -> ImageFont.FreeTypeFont:
         return ImageFont.truetype(fallback_font, size)
 
 
-@functools.lru_cache(maxsize=256)
+@functools.lru_cache(maxsize=4096)
 def extent_func(
     text: str,
     fonttype: str = "segoeui.ttf",
@@ -159,6 +159,38 @@ def extent_func(
     return (width * 10 / 7, height * 10 / 7)
 
 
+def _text_width(text: str) -> float:
+    """Calculate the width of ``text`` like :func:`extent_func`.
+
+    Unlike ``extent_func``, the result is not cached. This is meant for
+    the many intermediate measurements taken while word wrapping, which
+    would otherwise evict the final lines from the cache.
+    """
+    (width, _), _ = load_font("segoeui.ttf", 8).font.getsize(text)
+    return width * 10 / 7
+
+
+def _longest_fit(
+    count: int, fits: cabc.Callable[[int], bool], *, minimum: int = 0
+) -> int:
+    """Find the highest ``n <= count`` for which ``fits(n)`` is true.
+
+    ``fits`` must be monotonic, i.e. once it returns false for some
+    ``n``, it must also return false for all higher values. If no
+    value above ``minimum`` fits, ``minimum`` is returned.
+    """
+    if fits(count):
+        return count
+    low, high = minimum, count
+    while high - low > 1:
+        mid = (low + high) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
 def get_text_extent(
     text: str,
     width: float | int = math.inf,
@@ -270,12 +302,10 @@ def word_wrap(text: str, width: float | int) -> cabc.Sequence[str]:
             output_lines.append("")
             continue
 
-        words_count = len(words)
-        while (
-            extent_func(rejoin(words, 0, words_count))[0] > width
-            and words_count > 0
-        ):
-            words_count -= 1
+        words_count = _longest_fit(
+            len(words),
+            lambda n: _text_width(rejoin(words, 0, n)) <= width,
+        )
 
         if words_count > 0:
             output_lines.append(rejoin(words, 0, words_count))
@@ -284,12 +314,11 @@ def word_wrap(text: str, width: float | int) -> cabc.Sequence[str]:
 
         else:
             word = words.popleft()
-            letters_count = len(word)
-            while (
-                extent_func(word[:letters_count])[0] > width
-                and letters_count > 1
-            ):
-                letters_count -= 1
+            letters_count = _longest_fit(
+                len(word),
+                lambda n: _text_width(word[:n]) <= width,
+                minimum=1,
+            )
 
             output_lines.append(word[:letters_count])
             if letters_count < len(word):
@@ -11,9 +11,14 @@ __all__ = [
 
 import collections
 import collections.abc as cabc
+import concurrent.futures as cf
 import contextlib
+import copy
 import enum
+import hashlib
+import io
 import itertools
+import json
 import logging
 import operator
 import os.path
@@ -84,7 +89,55 @@ CROSS_FRAGMENT_LINK = re.compile(
     """,
     re.VERBOSE,
 )
+RE_LINK_TARGET = re.compile(r"#([^\s#]+)")
 METADATA_TAG = f"{{{_n.NAMESPACES['metadata']}}}Metadata"
+INDEX_CACHE_VERSION = 1
+INDEX_CACHE_MAX_SIZE = 256 * 1024**2
+
+
+_DocPosition = tuple[int, tuple[tuple[pathlib.PurePosixPath, int, int], ...]]
+"""A top-level fragment index and a path of positions in fragments.
+
+For an element, the path ends with the element's own position. For a
+fragment, it only contains the positions of the placeholders that link
+to it.
+"""
+
+
+def _prune_index_cache(directory: pathlib.Path, max_size: int) -> None:
+    """Remove the least recently used index cache files.
+
+    Files are removed until the total size of all ``*.json`` files in
+    ``directory`` drops to ``max_size`` bytes or below.
+    """
+    entries: list[tuple[float, int, str]] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as err:
+        LOGGER.warning("Cannot scan index cache %s: %s", directory, err)
+        return
+
+    size = sum(i[1] for i in entries)
+    entries.sort()
+    for _, entry_size, path in entries:
+        if size <= max_size:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            LOGGER.warning("Cannot prune index cache %s: %s", path, err)
+            continue
+        size -= entry_size
 
 
 def _verify_extension(filename: pathlib.PurePosixPath) -> None:
@@ -101,6 +154,44 @@ def _find_refs(root: etree._Element) -> cabc.Iterable[str]:
     )
 
 
+def _iter_ids(tree: ModelFile, subtree: etree._Element) -> cabc.Iterator[str]:
+    idtypes = IDTYPES_PER_FILETYPE[tree.filename.suffix]
+    for elm in subtree.iter():
+        for idtype in idtypes:
+            elm_id = elm.get(idtype, None)
+            if elm_id is not None:
+                yield elm_id
+
+
+def _holds_id(tree: ModelFile, elm_id: str) -> bool:
+    try:
+        tree[elm_id]
+    except KeyError:
+        return False
+    return True
+
+
+def _find_copy(
+    root: etree._Element, copied_root: etree._Element, elem: etree._Element
+) -> etree._Element:
+    """Find the copy of ``elem`` in a deep copy of ``root``."""
+    positions: list[int] = []
+    while elem is not root:
+        parent = elem.getparent()
+        assert parent is not None
+        positions.append(parent.index(elem))
+        elem = parent
+    for i in reversed(positions):
+        copied_root = copied_root[i]
+    return copied_root
+
+
+def _iter_link_targets(elm: etree._Element) -> cabc.Iterator[str]:
+    for value in elm.attrib.values():
+        if "#" in value:
+            yield from RE_LINK_TARGET.findall(value)
+
+
 def _unquote_ref(ref: str) -> str:
     ref = urllib.parse.unquote(ref)
     prefix = "platform:/resource/"
@@ -138,10 +229,20 @@ class ResourceLocationManager(dict):
 class ModelFile:
     """Represents a single file in the model (i.e. a fragment)."""
 
-    __xtypecache: dict[str, set[etree._Element]]
+    __xtypecache: dict[str, dict[etree._Element, None]]
     __idcache: dict[str, etree._Element]
     __hrefsources: dict[str, etree._Element]
 
+    dirty: bool
+    """Whether this fragment was modified since it was last saved.
+
+    Only dirty fragments are written back by :meth:`MelodyLoader.save`.
+    """
+
+    # Counts root replacements across all fragments, so that loaders can
+    # tell whether their index of root elements is still up to date
+    _root_replacements: t.ClassVar[int] = 0
+
     @property
     def fragment_type(self) -> FragmentType:
         if self.filename.suffix in SEMANTIC_EXTS:
@@ -167,19 +268,35 @@ class ModelFile:
         handler: filehandler.FileHandler,
         *,
         ignore_uuid_dups: bool,
+        index_cache: pathlib.Path | None = None,
     ) -> None:
         self.filename = filename
         self.filehandler = handler
+        self.dirty = False
         self.__ignore_uuid_dups = ignore_uuid_dups
         _verify_extension(filename)
 
-        with handler.open(filename) as f:
-            tree = etree.parse(
-                f, etree.XMLParser(remove_blank_text=True, huge_tree=True)
-            )
+        parser = etree.XMLParser(remove_blank_text=True, huge_tree=True)
+        if index_cache is None or ignore_uuid_dups:
+            with handler.open(filename) as f:
+                tree = etree.parse(f, parser)
+            self.root = tree.getroot()
+            self.idcache_rebuild()
+            return
 
+        with handler.open(filename) as f:
+            content = f.read()
+        tree = etree.parse(io.BytesIO(content), parser)
         self.root = tree.getroot()
-        self.idcache_rebuild()
+
+        digest = hashlib.sha256()
+        digest.update(f"{INDEX_CACHE_VERSION}\0{filename.suffix}\0".encode())
+        digest.update(content)
+        del content
+        cachefile = index_cache / f"{digest.hexdigest()}.json"
+        if not self.__idcache_load(cachefile):
+            self.idcache_rebuild()
+            self.__idcache_store(cachefile)
 
     def __getitem__(self, key: str) -> etree._Element:
         return self.__idcache[key]
@@ -194,7 +311,7 @@ class ModelFile:
         for elm in subtree.iter():
             xtype = helpers.xtype_of(elm)
             if xtype is not None:
-                self.__xtypecache[xtype].add(elm)
+                self.__xtypecache[xtype][elm] = None
 
             for idtype in idtypes:
                 elm_id = elm.get(idtype, None)
@@ -228,7 +345,7 @@ class ModelFile:
             for elm in source.iter():
                 xtype = helpers.xtype_of(elm)
                 if xtype:
-                    self.__xtypecache[xtype].remove(elm)
+                    del self.__xtypecache[xtype][elm]
                 for idtype in IDTYPES_RESOLVED:
                     elm_id = elm.get(idtype, None)
                     if elm_id is None:
@@ -245,12 +362,71 @@ class ModelFile:
     def idcache_rebuild(self) -> None:
         """Invalidate and rebuild this file's ID cache."""
         LOGGER.debug("Indexing file %s...", self.filename)
-        self.__xtypecache = collections.defaultdict(set)
+        self.__xtypecache = collections.defaultdict(dict)
         self.__idcache = {}
         self.__hrefsources = {}
         self.idcache_index(self.root)
         LOGGER.debug("Cached %d element IDs", len(self.__idcache))
 
+    def __idcache_load(self, cachefile: pathlib.Path) -> bool:
+        try:
+            with cachefile.open("rb") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Cannot read index cache %s: %s", cachefile, err)
+            return False
+
+        elements = list(self.root.iter())
+        try:
+            if data["elements"] != len(elements):
+                raise ValueError("Element count mismatch")
+            xtypecache = collections.defaultdict(dict)
+            for xtype, positions in data["xtypes"].items():
+                xtypecache[xtype] = dict.fromkeys(
+                    elements[i] for i in positions
+                )
+            idcache = {k: elements[v] for k, v in data["ids"].items()}
+            hrefsources = {k: elements[v] for k, v in data["hrefs"].items()}
+        except (KeyError, IndexError, TypeError, ValueError) as err:
+            LOGGER.warning("Ignoring bad index cache %s: %s", cachefile, err)
+            return False
+
+        try:
+            os.utime(cachefile)
+        except OSError:
+            pass
+        LOGGER.debug("Loaded index of %s from %s", self.filename, cachefile)
+        self.__xtypecache = xtypecache
+        self.__idcache = idcache
+        self.__hrefsources = hrefsources
+        return True
+
+    def __idcache_store(self, cachefile: pathlib.Path) -> None:
+        positions = {elm: i for i, elm in enumerate(self.root.iter())}
+        data = {
+            "elements": len(positions),
+            "xtypes": {
+                xtype: [positions[i] for i in elms]
+                for xtype, elms in self.__xtypecache.items()
+            },
+            "ids": {k: positions[v] for k, v in self.__idcache.items()},
+            "hrefs": {k: positions[v] for k, v in self.__hrefsources.items()},
+        }
+
+        tmpfile = cachefile.with_name(f"{cachefile.name}.{os.getpid()}.tmp")
+        try:
+            cachefile.parent.mkdir(parents=True, exist_ok=True)
+            with tmpfile.open("w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            tmpfile.replace(cachefile)
+        except OSError as err:
+            LOGGER.warning("Cannot write index cache %s: %s", cachefile, err)
+            tmpfile.unlink(missing_ok=True)
+            return
+        _prune_index_cache(cachefile.parent, INDEX_CACHE_MAX_SIZE)
+
     def idcache_reserve(self, new_id: str) -> None:
         """Reserve the given ID for an element to be inserted later."""
         self.__idcache[new_id] = None
@@ -282,6 +458,8 @@ class ModelFile:
             new_root.addnext(i)
 
         self.root = new_root
+        self.dirty = True
+        ModelFile._root_replacements += 1
 
     def iterall_xt(
         self, xtypes: cabc.Container[str]
@@ -328,6 +506,26 @@ class ModelFile:
 class MelodyLoader:
     """Facilitates extensive access to Polarsys / Capella projects."""
 
+    generation: int
+    """A counter that is increased with every structural change.
+
+    Structural changes are those announced through :meth:`idcache_index`
+    and :meth:`idcache_remove`, as well as rebuilding the ID caches and
+    adding namespaces. Higher-level caches can compare this counter
+    against a previously stored value to find out whether they need to
+    be invalidated.
+    """
+
+    mutations: int
+    """A counter that is increased with every change to the model.
+
+    In addition to the structural changes counted by :attr:`generation`,
+    this includes every change announced through :meth:`mark_dirty`,
+    like writing attributes or links. Caches that depend on the contents
+    of elements, and not only on the tree structure, should compare this
+    counter instead.
+    """
+
     def __init__(
         self,
         path: str | os.PathLike | filehandler.FileHandler,
@@ -338,6 +536,8 @@ class MelodyLoader:
             filehandler.FileHandler | str | os.PathLike | dict[str, t.Any],
         ]
         | None = None,
+        load_workers: int = 0,
+        index_cache: str | os.PathLike | None = None,
         **kwargs: t.Any,
     ) -> None:
         """Construct a MelodyLoader.
@@ -353,6 +553,22 @@ class MelodyLoader:
         resources
             Additional file handler instances that provide library
             resources that are referenced from the model.
+        load_workers
+            If greater than zero, fetch and parse the model's fragments
+            concurrently, using a pool with this many threads. This
+            mostly benefits file handlers that have to wait on a remote
+            location or subprocess, like the ``git://`` or ``http(s)://``
+            handlers. The resulting :attr:`trees` are the same as with
+            the default, sequential loading.
+        index_cache
+            A local directory to store the indexes of loaded fragments
+            in. When a fragment with the same contents is loaded again
+            later, its stored index is reused instead of rebuilding it
+            from scratch, which speeds up reopening unchanged models.
+            The same directory can be shared between multiple models.
+            Once its index files grow beyond
+            :data:`INDEX_CACHE_MAX_SIZE` bytes in total, the least
+            recently used ones are removed.
         kwargs
             Additional arguments to the primary file handler, if
             necessary.
@@ -381,6 +597,9 @@ class MelodyLoader:
         self.__ignore_uuid_dups: bool = kwargs.pop(
             "ignore_duplicate_uuids_and_void_all_warranties", False
         )
+        self.__index_cache: pathlib.Path | None = None
+        if index_cache is not None:
+            self.__index_cache = pathlib.Path(index_cache)
 
         if isinstance(path, filehandler.FileHandler):
             handler = path
@@ -404,9 +623,30 @@ class MelodyLoader:
             raise ValueError("Invalid entrypoint, specify the ``.aird`` file")
 
         self.trees: dict[pathlib.PurePosixPath, ModelFile] = {}
-        self.__load_referenced_files(
-            pathlib.PurePosixPath("\0", self.entrypoint)
-        )
+        self.__rootindex: dict[etree._Element, pathlib.PurePosixPath] = {}
+        self.__rootindex_stamp: tuple[int, int] | None = None
+        self.__trees_version = 0
+        self.__uuidindex: dict[str, pathlib.PurePosixPath] = {}
+        self.__uuiddups: set[str] = set()
+        self.__refindex: dict[str, dict[etree._Element, None]] | None
+        self.__refindex = None
+        self.__docorder: dict[
+            pathlib.PurePosixPath, dict[etree._Element, tuple[int, int]]
+        ] = {}
+        self.__docchains: dict[pathlib.PurePosixPath, _DocPosition] | None
+        self.__docchains = None
+        self.__snapshots: dict[
+            pathlib.PurePosixPath, tuple[etree._ElementTree, bool]
+        ] | None = None
+        self.generation = 0
+        self.mutations = 0
+        entrypoint_path = pathlib.PurePosixPath("\0", self.entrypoint)
+        if load_workers > 0:
+            self.__load_referenced_files_parallel(
+                entrypoint_path, load_workers
+            )
+        else:
+            self.__load_referenced_files(entrypoint_path)
 
         self.check_duplicate_uuids()
 
@@ -452,21 +692,107 @@ class MelodyLoader:
         if resource_path in self.trees:
             return
 
+        frag = self.__load_fragment(resource_path)
+        self.trees[resource_path] = frag
+        self.__trees_version += 1
+        self.__uuidindex_add(resource_path, frag.enumerate_uuids())
+        refs = list(self.__find_referenced_fragments(resource_path, frag))
+        self.__prefetch(i for i in refs if i not in self.trees)
+        for ref_name in refs:
+            self.__load_referenced_files(ref_name)
+
+    def __load_referenced_files_parallel(
+        self, entrypoint: pathlib.PurePosixPath, workers: int
+    ) -> None:
+        loaded: dict[pathlib.PurePosixPath, ModelFile] = {}
+        refs: dict[pathlib.PurePosixPath, list[pathlib.PurePosixPath]] = {}
+
+        with cf.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="capellambse-loader"
+        ) as pool:
+            pending = {
+                pool.submit(self.__load_fragment, entrypoint): entrypoint
+            }
+            seen = {entrypoint}
+            try:
+                while pending:
+                    done, _ = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+                    for future in done:
+                        resource_path = pending.pop(future)
+                        frag = loaded[resource_path] = future.result()
+                        refs[resource_path] = children = list(
+                            self.__find_referenced_fragments(
+                                resource_path, frag
+                            )
+                        )
+                        children = [
+                            i for i in dict.fromkeys(children) if i not in seen
+                        ]
+                        seen.update(children)
+                        self.__prefetch(children)
+                        for ref_name in children:
+                            future = pool.submit(
+                                self.__load_fragment, ref_name
+                            )
+                            pending[future] = ref_name
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        # Insert the fragments in the same depth-first order that the
+        # sequential loader would have produced
+        stack = [entrypoint]
+        while stack:
+            resource_path = stack.pop()
+            if resource_path in self.trees:
+                continue
+            frag = self.trees[resource_path] = loaded[resource_path]
+            self.__trees_version += 1
+            self.__uuidindex_add(resource_path, frag.enumerate_uuids())
+            stack.extend(reversed(refs[resource_path]))
+
+    def __prefetch(
+        self, resource_paths: cabc.Iterable[pathlib.PurePosixPath]
+    ) -> None:
+        by_resource: dict[str, list[pathlib.PurePosixPath]] = {}
+        for i in resource_paths:
+            filename = pathlib.PurePosixPath(*i.parts[1:])
+            by_resource.setdefault(i.parts[0], []).append(filename)
+        for resname, filenames in by_resource.items():
+            try:
+                handler = self.resources[resname]
+            except KeyError:
+                continue
+            handler.prefetch(filenames)
+
+    def __load_fragment(
+        self, resource_path: pathlib.PurePosixPath
+    ) -> ModelFile:
         handler = self.resources[resource_path.parts[0]]
         filename = pathlib.PurePosixPath(*resource_path.parts[1:])
-        frag = ModelFile(
-            filename, handler, ignore_uuid_dups=self.__ignore_uuid_dups
+        return ModelFile(
+            filename,
+            handler,
+            ignore_uuid_dups=self.__ignore_uuid_dups,
+            index_cache=self.__index_cache,
         )
-        self.trees[resource_path] = frag
+
+    @staticmethod
+    def __find_referenced_fragments(
+        resource_path: pathlib.PurePosixPath, frag: ModelFile
+    ) -> cabc.Iterator[pathlib.PurePosixPath]:
         for ref in _find_refs(frag.root):
-            ref_name = helpers.normalize_pure_path(
+            yield helpers.normalize_pure_path(
                 _unquote_ref(ref), base=resource_path.parent
             )
-            self.__load_referenced_files(ref_name)
 
-    def save(self, **kw: t.Any) -> None:
+    def save(self, **kw: t.Any) -> list[pathlib.PurePosixPath]:
         # pylint: disable=line-too-long
-        """Save all model files back to their original locations.
+        """Save modified model files back to their original locations.
+
+        Only fragments that were modified since they were loaded or last
+        saved are written, see :meth:`mark_dirty`.
 
         Parameters
         ----------
@@ -474,6 +800,12 @@ class MelodyLoader:
             Additional keyword arguments accepted by the file handler in
             use. Please see the respective documentation for more info.
 
+        Returns
+        -------
+        list[pathlib.PurePosixPath]
+            The names of the fragments that were written, relative to
+            the primary file handler.
+
         See Also
         --------
         capellambse.filehandler.localfilehandler.LocalFileHandler.write_transaction :
@@ -500,21 +832,68 @@ class MelodyLoader:
                 " (hint: pass i_have_a_recent_backup=True)"
             )
 
-        LOGGER.debug("Saving model %r", self.get_model_info().title)
+        dirty = {
+            pathlib.PurePosixPath(*fname.parts[1:]): tree
+            for fname, tree in self.trees.items()
+            if tree.dirty and fname.parts[0] == "\0"
+        }
+        LOGGER.debug(
+            "Saving model %r (%d modified fragments)",
+            self.get_model_info().title,
+            len(dirty),
+        )
         with self.filehandler.write_transaction(**kw) as unsupported_kws:
             if unsupported_kws:
                 LOGGER.warning(
                     "Ignoring unsupported transaction parameters: %s",
                     ", ".join(repr(k) for k in unsupported_kws),
                 )
-            for fname, tree in self.trees.items():
-                resname = fname.parts[0]
-                fname = pathlib.PurePosixPath(*fname.parts[1:])
-                if resname != "\0":
-                    continue
-
+            for fname, tree in dirty.items():
                 tree.write_xml(fname)
 
+        for tree in dirty.values():
+            tree.dirty = False
+        return list(dirty)
+
+    def mark_dirty(
+        self,
+        fragment: str | pathlib.PurePosixPath | etree._Element,
+        /,
+    ) -> None:
+        """Mark a fragment as modified, so that :meth:`save` writes it.
+
+        The modifying methods of the loader, as well as the high-level
+        model API, take care of this automatically. Code that modifies
+        the XML trees directly has to call this method itself, or its
+        changes will not be saved.
+
+        Within a :meth:`transaction`, this method has to be called
+        *before* making the changes, so that the fragment's original
+        state can be restored if the transaction fails.
+
+        Parameters
+        ----------
+        fragment
+            Either the name of a fragment (as
+            :class:`~pathlib.PurePosixPath` or :class:`str`), or a model
+            element. In the latter case, the fragment that contains this
+            element is marked. Elements that are not part of any
+            fragment are ignored.
+        """
+        self.mutations += 1
+        if isinstance(fragment, etree._Element):
+            try:
+                name, tree = self._find_fragment(fragment)
+            except ValueError:
+                return
+        elif isinstance(fragment, (str, pathlib.PurePosixPath)):
+            name = pathlib.PurePosixPath(fragment)
+            tree = self.trees[name]
+        else:
+            raise TypeError(f"Invalid fragment specifier {fragment!r}")
+        self.__snapshot(name, tree)
+        tree.dirty = True
+
     def idcache_index(self, subtree: etree._Element) -> None:
         """Index the IDs of ``subtree``.
 
@@ -527,13 +906,21 @@ class MelodyLoader:
             The new element that was just inserted.
         """
         try:
-            _, tree = self._find_fragment(subtree)
+            fragment, tree = self._find_fragment(subtree)
         except ValueError:
             raise ValueError(
                 "Call idcache_index() after adding the subtree"
             ) from None
 
+        self.__snapshot(fragment, tree, subtree)
         tree.idcache_index(subtree)
+        tree.dirty = True
+        self.__uuidindex_add(fragment, _iter_ids(tree, subtree))
+        self.__docorder_invalidate(fragment)
+        self.generation += 1
+        self.mutations += 1
+        if tree.fragment_type is not FragmentType.VISUAL:
+            self.__refindex_add(subtree)
 
     def idcache_remove(self, subtree: etree._Element) -> None:
         """Remove the ``subtree`` from the ID cache.
@@ -547,18 +934,199 @@ class MelodyLoader:
             The element that is about to be removed.
         """
         try:
-            _, tree = self._find_fragment(subtree)
+            fragment, tree = self._find_fragment(subtree)
         except ValueError:
             raise ValueError(
                 "Call idcache_remove() before removing the subtree"
             ) from None
 
+        self.__snapshot(fragment, tree)
+        self.__uuidindex_remove(fragment, _iter_ids(tree, subtree))
+        self.__refindex_remove(subtree)
+        self.__docorder_invalidate(fragment)
+        self.generation += 1
+        self.mutations += 1
         tree.idcache_remove(subtree)
+        tree.dirty = True
 
     def idcache_rebuild(self) -> None:
         r"""Rebuild the ID caches of all :class:`ModelFile`\ s."""
-        for tree in self.trees.values():
+        self.__uuidindex = {}
+        self.__uuiddups = set()
+        self.__refindex = None
+        self.__docorder = {}
+        self.__docchains = None
+        self.__trees_version += 1
+        self.generation += 1
+        self.mutations += 1
+        for fragment, tree in self.trees.items():
             tree.idcache_rebuild()
+            self.__uuidindex_add(fragment, tree.enumerate_uuids())
+
+    @contextlib.contextmanager
+    def transaction(self) -> cabc.Iterator[None]:
+        """Group a series of modifications into a transaction.
+
+        If an exception escapes from the ``with`` block, all fragments
+        modified within it are restored to the state they had before
+        the block was entered, and the exception is re-raised. Elements
+        of these fragments which were obtained before or during the
+        transaction must not be used anymore afterwards.
+
+        To be able to do this, a copy of each fragment is taken right
+        before it is modified for the first time within the block, i.e.
+        when the modification is announced through :meth:`mark_dirty`,
+        :meth:`idcache_index`, :meth:`idcache_remove` or
+        :meth:`add_namespace`. Fragments that are not modified are not
+        copied.
+
+        Nested transactions are merged into the outermost one.
+        """
+        if self.__snapshots is not None:
+            yield
+            return
+
+        snapshots = self.__snapshots = {}
+        try:
+            yield
+        except BaseException:
+            for fragment, (doc, dirty) in snapshots.items():
+                tree = self.trees[fragment]
+                tree.root = doc.getroot()
+                tree.dirty = dirty
+            LOGGER.debug("Rolled back %d fragments", len(snapshots))
+            self.idcache_rebuild()
+            raise
+        finally:
+            self.__snapshots = None
+
+    def __snapshot(
+        self,
+        fragment: pathlib.PurePosixPath,
+        tree: ModelFile,
+        inserted: etree._Element | None = None,
+    ) -> None:
+        """Copy a fragment before it is first modified in a transaction.
+
+        If the modification is only announced after it was made, i.e.
+        by :meth:`idcache_index`, the ``inserted`` subtree is removed
+        from the copy again.
+        """
+        if self.__snapshots is None or fragment in self.__snapshots:
+            return
+
+        doc = copy.deepcopy(tree.root.getroottree())
+        if inserted is not None:
+            copied = _find_copy(tree.root, doc.getroot(), inserted)
+            parent = copied.getparent()
+            assert parent is not None
+            parent.remove(copied)
+        self.__snapshots[fragment] = (doc, tree.dirty)
+
+    def __uuidindex_add(
+        self, fragment: pathlib.PurePosixPath, uuids: cabc.Iterable[str]
+    ) -> None:
+        for elm_id in uuids:
+            existing = self.__uuidindex.setdefault(elm_id, fragment)
+            if existing != fragment:
+                self.__uuiddups.add(elm_id)
+
+    def __uuidindex_remove(
+        self, fragment: pathlib.PurePosixPath, uuids: cabc.Iterable[str]
+    ) -> None:
+        for elm_id in uuids:
+            if elm_id not in self.__uuiddups:
+                if self.__uuidindex.get(elm_id) == fragment:
+                    del self.__uuidindex[elm_id]
+                continue
+
+            holders = [
+                k
+                for k, v in self.trees.items()
+                if k != fragment and _holds_id(v, elm_id)
+            ]
+            if len(holders) <= 1:
+                self.__uuiddups.discard(elm_id)
+            if holders:
+                self.__uuidindex[elm_id] = holders[0]
+            else:
+                self.__uuidindex.pop(elm_id, None)
+
+    def find_references(self, target_id: str) -> list[etree._Element]:
+        """Find the elements that may hold a reference to ``target_id``.
+
+        An element is returned if one of its own attributes or one of
+        its direct children's attributes contains a link to the target.
+        Elements in visual fragments are not considered. Like with
+        :meth:`xpath`, fragment placeholders are replaced by the
+        element they link to.
+
+        The result is taken from a reverse reference index, which is
+        built on the first call and afterwards kept up to date by
+        :meth:`idcache_index`, :meth:`idcache_remove` and
+        :meth:`create_link`. As links may be overwritten or removed
+        without notice, the returned elements are only candidates, and
+        callers need to verify that the reference still exists.
+
+        Parameters
+        ----------
+        target_id
+            The UUID of the referenced element.
+        """
+        if self.__refindex is None:
+            LOGGER.debug("Building reverse reference index")
+            self.__refindex = {}
+            for tree in self.trees.values():
+                if tree.fragment_type is not FragmentType.VISUAL:
+                    self.__refindex_add(tree.root)
+
+        sources = self.__refindex.get(target_id, {})
+        stale = []
+        for elm in sources:
+            try:
+                self._find_fragment(elm)
+            except ValueError:
+                stale.append(elm)
+        for elm in stale:
+            del sources[elm]
+        return [self._follow_href(i) for i in sources]
+
+    def __refindex_add(
+        self,
+        subtree: etree._Element,
+        targets: cabc.Iterable[str] | None = None,
+    ) -> None:
+        if self.__refindex is None:
+            return
+
+        if targets is not None:
+            parent = subtree.getparent()
+            for target in targets:
+                sources = self.__refindex.setdefault(target, {})
+                sources[subtree] = None
+                if parent is not None:
+                    sources[parent] = None
+            return
+
+        for elm in subtree.iter():
+            for target in _iter_link_targets(elm):
+                sources = self.__refindex.setdefault(target, {})
+                sources[elm] = None
+                if (parent := elm.getparent()) is not None:
+                    sources[parent] = None
+
+    def __refindex_remove(self, subtree: etree._Element) -> None:
+        if self.__refindex is None:
+            return
+
+        for elm in subtree.iter():
+            for target in _iter_link_targets(elm):
+                sources = self.__refindex.get(target)
+                if sources is None:
+                    continue
+                sources.pop(elm, None)
+                if elm is not subtree:
+                    sources.pop(elm.getparent(), None)
 
     def add_namespace(
         self,
@@ -596,7 +1164,13 @@ class MelodyLoader:
             except KeyError:
                 raise ValueError(f"Unknown namespace {name!r}") from None
 
-        self.trees[fragment].add_namespace(name, uri)
+        tree = self.trees[fragment]
+        if tree.root.nsmap.get(name) != uri:
+            self.__snapshot(fragment, tree)
+        tree.add_namespace(name, uri)
+        self.__docorder_invalidate(fragment)
+        self.generation += 1
+        self.mutations += 1
 
     def generate_uuid(
         self, parent: etree._Element, *, want: str | None = None
@@ -628,13 +1202,14 @@ class MelodyLoader:
             while True:
                 yield str(uuid.uuid4())
 
-        _, tree = self._find_fragment(parent)
+        fragment, tree = self._find_fragment(parent)
 
         for new_id in idstream():
             try:
                 self[new_id]
             except KeyError:
                 tree.idcache_reserve(new_id)
+                self.__uuidindex_add(fragment, (new_id,))
                 return new_id
         assert False
 
@@ -674,11 +1249,12 @@ class MelodyLoader:
             Request this UUID. The request may or may not be fulfilled;
             always use the actual UUID returned by the context manager.
         """
-        _, tree = self._find_fragment(parent)
+        fragment, tree = self._find_fragment(parent)
         new_uuid = self.generate_uuid(parent, want=want)
 
         def cleanup_after_failure() -> None:
             tree.idcache_remove(new_uuid)
+            self.__uuidindex_remove(fragment, (new_uuid,))
             for child in parent:
                 for id_attr in IDTYPES_RESOLVED:
                     if child.get(id_attr) == new_uuid:
@@ -868,6 +1444,163 @@ class MelodyLoader:
             map(operator.methodcaller("iterall_xt", xtset), files)
         )
 
+    def is_descendant(
+        self, element: etree._Element, ancestor: etree._Element
+    ) -> bool:
+        """Check whether ``element`` is nested below ``ancestor``.
+
+        Unlike lxml's own ``iterancestors()``, this method follows
+        fragment links back to their origin point, and it does so by
+        comparing the elements' positions in the :meth:`document order
+        <sort_document_order>`.
+
+        Elements are not considered to be their own descendants.
+        """
+        anc = self.__docposition(ancestor)
+        elm = self.__docposition(element)
+        if anc is None or elm is None:
+            return False
+
+        (anc_fragment, anc_pre, anc_post) = anc[1][-1]
+        *placeholders, (elm_fragment, elm_pre, _) = elm[1]
+        if elm_fragment == anc_fragment and anc_pre < elm_pre < anc_post:
+            return True
+        return any(
+            fragment == anc_fragment and anc_pre <= pre < anc_post
+            for fragment, pre, _ in placeholders
+        )
+
+    def sort_document_order(
+        self, elements: cabc.Iterable[etree._Element]
+    ) -> list[etree._Element]:
+        """Sort the given elements in model-wide document order.
+
+        The document order is determined by walking all fragments in
+        the order of :attr:`trees`, where fragments that are linked from
+        a placeholder element in another fragment of the same
+        :class:`FragmentType` are walked at the placeholder's position
+        instead. Elements that are not found this way retain their
+        relative order, and are sorted after all others.
+
+        Only the fragments that contain the given elements (and those
+        that link to them) are numbered. The numbering of a fragment is
+        kept until one of its elements is added or removed.
+        """
+        unknown = (sys.maxsize,)
+
+        def key(element: etree._Element) -> tuple[int, ...]:
+            position = self.__docposition(element)
+            if position is None:
+                return unknown
+            toplevel, path = position
+            return (toplevel, *(pre for _, pre, _ in path))
+
+        return sorted(elements, key=key)
+
+    def __docorder_invalidate(self, fragment: pathlib.PurePosixPath) -> None:
+        self.__docorder.pop(fragment, None)
+        self.__docchains = None
+
+    def __docposition(self, element: etree._Element) -> _DocPosition | None:
+        try:
+            fragment, tree = self._find_fragment(element)
+        except ValueError:
+            return None
+        position = self.__docorder_fragment(fragment, tree).get(element)
+        if position is None:
+            return None
+
+        chains = self.__docchains
+        if chains is None or chains.keys() != self.trees.keys():
+            chains = self.__docchains = self.__docorder_chains()
+        toplevel, placeholders = chains[fragment]
+        return (toplevel, (*placeholders, (fragment, *position)))
+
+    def __docorder_fragment(
+        self, fragment: pathlib.PurePosixPath, tree: ModelFile
+    ) -> dict[etree._Element, tuple[int, int]]:
+        try:
+            return self.__docorder[fragment]
+        except KeyError:
+            pass
+
+        LOGGER.debug("Numbering elements of %s in document order", fragment)
+        positions: dict[etree._Element, tuple[int, int]] = {}
+        counter = itertools.count()
+        starts = {tree.root: next(counter)}
+        stack = [(tree.root, tree.root.iterchildren())]
+        while stack:
+            elm, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                positions[elm] = (starts.pop(elm), next(counter))
+            else:
+                starts[child] = next(counter)
+                stack.append((child, child.iterchildren()))
+
+        self.__docorder[fragment] = positions
+        return positions
+
+    def __docorder_chains(self) -> dict[pathlib.PurePosixPath, _DocPosition]:
+        """Find the placeholders that each fragment is linked from."""
+        mounts: dict[
+            pathlib.PurePosixPath,
+            tuple[pathlib.PurePosixPath, etree._Element],
+        ] = {}
+        for fragment, tree in self.trees.items():
+            for other_fragment, other in self.trees.items():
+                if (
+                    other is tree
+                    or other.fragment_type is not tree.fragment_type
+                ):
+                    continue
+                placeholder = next(
+                    (
+                        elm
+                        for idtype in IDTYPES_RESOLVED
+                        if (root_id := tree.root.get(idtype))
+                        if (elm := other.unfollow_href(root_id)) is not None
+                    ),
+                    None,
+                )
+                if placeholder is not None:
+                    mounts[fragment] = (other_fragment, placeholder)
+                    break
+
+        toplevel = [i for i in self.trees if i not in mounts]
+        chains: dict[pathlib.PurePosixPath, _DocPosition] = {}
+
+        def chain(
+            fragment: pathlib.PurePosixPath,
+            seen: frozenset[pathlib.PurePosixPath],
+        ) -> _DocPosition:
+            if fragment in chains:
+                return chains[fragment]
+            if fragment not in mounts or fragment in seen:
+                # Unlinked or cyclically linked fragments are walked on
+                # their own, after all regular top-level fragments
+                try:
+                    return (toplevel.index(fragment), ())
+                except ValueError:
+                    return (
+                        len(toplevel) + list(self.trees).index(fragment),
+                        (),
+                    )
+
+            parent, placeholder = mounts[fragment]
+            position = self.__docorder_fragment(
+                parent, self.trees[parent]
+            ).get(placeholder)
+            if position is None:
+                return (len(toplevel) + list(self.trees).index(fragment), ())
+            toplevel_index, placeholders = chain(parent, seen | {fragment})
+            return (toplevel_index, (*placeholders, (parent, *position)))
+
+        for fragment in self.trees:
+            chains[fragment] = chain(fragment, frozenset())
+        return chains
+
     def iterdescendants(
         self,
         root_elm: etree._Element,
@@ -1026,9 +1759,13 @@ class MelodyLoader:
         to_uuid = to_element.get(to_uuid)
 
         # Find the fragments corresponding to each tree
-        from_fragment, _ = self._find_fragment(from_element)
+        from_fragment, from_tree = self._find_fragment(from_element)
         to_fragment, _ = self._find_fragment(to_element)
         assert from_fragment and to_fragment
+        from_tree.dirty = True
+
+        if from_tree.fragment_type is not FragmentType.VISUAL:
+            self.__refindex_add(from_element, (to_uuid,))
 
         if from_fragment == to_fragment:
             return f"#{to_uuid}"
@@ -1098,6 +1835,16 @@ class MelodyLoader:
             from_element: etree._Element | None,
             fragment: pathlib.PurePosixPath | None,
         ) -> cabc.Iterable[ModelFile]:
+            if ref not in self.__uuiddups and (
+                fragment is None or from_element is None
+            ):
+                indexed = self.__uuidindex.get(ref)
+                if indexed is None:
+                    return ()
+                if fragment and indexed.name != fragment.name:
+                    return ()
+                return (self.trees[indexed],)
+
             if fragment and from_element is None:
                 return (
                     v for k, v in self.trees.items() if k.name == fragment.name
@@ -1206,13 +1953,24 @@ class MelodyLoader:
     def _find_fragment(
         self, element: etree._Element
     ) -> tuple[pathlib.PurePosixPath, ModelFile]:
+        # Note: getroottree() is not usable here, because detached
+        # subtrees still report their former document's root
         root = collections.deque(
             itertools.chain([element], element.iterancestors()), 1
         )[0]
-        for fragment, tree in self.trees.items():
-            if tree.root is root:
-                return (fragment, tree)
-        raise ValueError("Element is not contained in any fragment")
+        stamp = (self.__trees_version, ModelFile._root_replacements)
+        if self.__rootindex_stamp != stamp:
+            # A fragment was added or had its root replaced since the
+            # index was built (see :meth:`ModelFile.add_namespace`)
+            self.__rootindex = {t.root: k for k, t in self.trees.items()}
+            self.__rootindex_stamp = stamp
+        try:
+            fragment = self.__rootindex[root]
+        except KeyError:
+            raise ValueError(
+                "Element is not contained in any fragment"
+            ) from None
+        return (fragment, self.trees[fragment])
 
     def _follow_href(self, element: etree._Element) -> etree._Element:
         href = element.get("href")
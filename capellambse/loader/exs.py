@@ -24,12 +24,16 @@ import lxml.etree
 INDENT = b"  "
 LINESEP = os.linesep.encode("ascii")
 LINE_LENGTH = 80
+CHUNK_SIZE = 64 * 1024
+"""Number of bytes to collect before passing them on to the file."""
 
 ESCAPE_CHARS = r"[\x00-\x1F\x7F{}]"
 P_ESCAPE_TEXT = re.compile(ESCAPE_CHARS.format('"&<'))
 P_ESCAPE_COMMENTS = re.compile(ESCAPE_CHARS.format(">"))
 P_NAME = re.compile(r"^(?:\{([^}]*)\})?(.+)$")
 
+XMI_VERSION = "{http://www.omg.org/XMI}version"
+
 ALWAYS_EXPANDED_TAGS = frozenset({"bodies"})
 
 
@@ -39,6 +43,35 @@ class _HasWrite(t.Protocol):
         ...
 
 
+class _ChunkedWriter(io.BytesIO):
+    """Buffer serialized XML and pass it on to ``file`` in chunks."""
+
+    def __init__(self, file: _HasWrite, chunk_size: int) -> None:
+        super().__init__()
+        self.__file = file
+        self.__chunk_size = chunk_size
+
+    def spill(self, *, force: bool = False) -> None:
+        """Write the buffer to the file if it reached the chunk size."""
+        if force or self.tell() >= self.__chunk_size:
+            self.__file.write(self.getvalue())
+            self.seek(0)
+            self.truncate()
+
+
+class _NameMap(dict):
+    """Cache the prefixed forms of qualified names under one ``nsmap``."""
+
+    def __init__(self, nsmap: cabc.Mapping[str | None, str]) -> None:
+        super().__init__()
+        self.source = nsmap
+        self.nsmap = dict((v, k) for k, v in nsmap.items())
+
+    def __missing__(self, name: str) -> str:
+        self[name] = value = _unmap_namespace(self.nsmap, name)
+        return value
+
+
 def to_string(tree: lxml.etree._Element, /) -> str:
     """Serialize an XML tree as a ``str``.
 
@@ -121,6 +154,12 @@ def write(
         The number of characters after which to force a line break.
     siblings
         Also include siblings of the given subtree.
+
+    Notes
+    -----
+    The XML is written to ``file`` in chunks of about
+    :data:`CHUNK_SIZE` bytes while it is being serialized, instead of
+    building the whole document in memory first.
     """
     ctx: t.ContextManager[_HasWrite]
     if isinstance(file, _HasWrite):
@@ -128,16 +167,18 @@ def write(
     else:
         ctx = open(file, "wb")
 
-    payload = serialize(
-        tree,
-        encoding=encoding,
-        errors=errors,
-        line_length=line_length,
-        siblings=siblings,
-    )
     with ctx as f:
-        f.write(_declare(encoding))
-        f.write(payload)
+        buffer = _ChunkedWriter(f, CHUNK_SIZE)
+        buffer.write(_declare(encoding))
+        _serialize_tree(
+            buffer,
+            tree,
+            encoding=encoding,
+            errors=errors,
+            line_length=line_length,
+            siblings=siblings,
+        )
+        buffer.spill(force=True)
 
 
 def serialize(
@@ -174,6 +215,27 @@ def serialize(
         An iterator that yields the serialized XML piece by piece.
     """
     buffer = io.BytesIO()
+    _serialize_tree(
+        buffer,
+        tree,
+        encoding=encoding,
+        errors=errors,
+        line_length=line_length,
+        siblings=siblings,
+    )
+    return buffer.getvalue()
+
+
+def _serialize_tree(
+    buffer: _HasWrite,
+    tree: lxml.etree._Element | lxml.etree._ElementTree,
+    /,
+    *,
+    encoding: str,
+    errors: str,
+    line_length: float | int,
+    siblings: bool | None,
+) -> None:
     root: lxml.etree._Element
     preceding_siblings: cabc.Iterable[lxml.etree._Comment]
     following_siblings: cabc.Iterable[lxml.etree._Comment]
@@ -224,7 +286,6 @@ def serialize(
         )
 
     buffer.write(b"\n")
-    return buffer.getvalue()
 
 
 def _declare(encoding: str) -> bytes:
@@ -253,29 +314,20 @@ def _escape_char(
 
 
 def _unmapped_attrs(
-    nsmap: cabc.Mapping[str, str], element: lxml.etree._Element
+    names: _NameMap,
+    element: lxml.etree._Element,
+    nsdecls: cabc.Iterable[tuple[str | None, str]],
 ) -> cabc.Iterator[tuple[str, str]]:
-    if element.getparent() is None:
-        parent_ns = set()
-    else:
-        parent_ns = set(element.getparent().nsmap)
-
-    attribs = dict(element.items())
-    try:
-        yield (
-            _unmap_namespace(nsmap, "xmi:version"),
-            _escape(attribs.pop("{http://www.omg.org/XMI}version")),
-        )
-    except KeyError:
-        pass
+    version = element.get(XMI_VERSION)
+    if version is not None:
+        yield ("xmi:version", _escape(version))
 
-    for attr, value in element.nsmap.items():
-        if attr in parent_ns:
-            continue
+    for attr, value in nsdecls:
         yield (f"xmlns:{attr}", value)
 
-    for attr, value in attribs.items():
-        yield (_unmap_namespace(nsmap, attr), _escape(value))
+    for attr, value in element.items():
+        if attr != XMI_VERSION:
+            yield (names[attr], _escape(value))
 
 
 def _serialize_comment(
@@ -323,17 +375,31 @@ def _serialize_element(
     errors: str,
     pos: int = 0,
     line_length: float | int,
+    names: _NameMap | None = None,
 ) -> int:
     assert isinstance(element, lxml.etree._Element)
-    nsmap = dict((v, k) for k, v in element.nsmap.items())
+    parent = element.getparent()
+    nsmap = element.nsmap
+    nsdecls: cabc.Iterable[tuple[str | None, str]]
+    if names is None:
+        parent_ns = parent.nsmap if parent is not None else {}
+        names = _NameMap(nsmap)
+        nsdecls = [(k, v) for k, v in nsmap.items() if k not in parent_ns]
+    elif nsmap == names.source:
+        nsdecls = ()
+    else:
+        parent_ns = names.source
+        names = _NameMap(nsmap)
+        nsdecls = [(k, v) for k, v in nsmap.items() if k not in parent_ns]
+
     buffer.write(b"<")
-    tag = _unmap_namespace(nsmap, element.tag).encode(encoding, errors)
+    tag = names[element.tag].encode(encoding, errors)
     buffer.write(tag)
 
     pos += 1 + len(tag)
     attr_indent = INDENT * (indent + 2)
     force_break = False
-    for attr, value in _unmapped_attrs(nsmap, element):
+    for attr, value in _unmapped_attrs(names, element, nsdecls):
         if pos > line_length or force_break:
             buffer.write(LINESEP)
             buffer.write(attr_indent)
@@ -349,7 +415,7 @@ def _serialize_element(
         buffer.write(b'"')
         pos += len(attr) + len(value) + 3
 
-        if element.getparent() is None and attr == "id":
+        if parent is None and attr == "id":
             force_break = True
 
     if (
@@ -389,7 +455,10 @@ def _serialize_element(
             errors=errors,
             pos=pos,
             line_length=line_length,
+            names=names,
         )
+        if isinstance(buffer, _ChunkedWriter):
+            buffer.spill()
         if (element.tail or "").strip():
             pos = _serialize_text(
                 buffer, element.tail, encoding=encoding, errors=errors, pos=pos
@@ -540,6 +540,8 @@ class XMLDictProxy(cabc.MutableMapping):
             self.xml_element.append(elem)
             if self.model is not None:
                 self.model.idcache_index(elem)
+        if self.model is not None:
+            self.model.mark_dirty(elem)
         self._insert_value(elem, value)
 
     def __delitem__(self, key: str) -> None:
@@ -18,13 +18,14 @@ import pathlib
 import re
 import shutil
 import typing as t
+import weakref
 
 from lxml import etree
 
 import capellambse
 import capellambse.helpers
 import capellambse.pvmt
-from capellambse import _diagram_cache, filehandler, loader
+from capellambse import _diagram_cache, _render_cache, filehandler, loader
 
 from . import common, diagram  # isort:skip
 
@@ -87,7 +88,15 @@ class MelodyModel:
     name = common.AttributeProperty("name", __doc__="The name of this model.")
 
     _diagram_cache: filehandler.FileHandler
+    _diagram_descriptors: diagram.DiagramDescriptorTable | None
     _diagram_cache_subdir: pathlib.PurePosixPath
+    _render_cache: _render_cache.RenderCache
+    _class_cache: tuple[int, dict[etree._Element, type[GenericElement]]]
+    _proxy_cache: weakref.WeakValueDictionary[etree._Element, GenericElement]
+    _reference_index: dict[
+        common.ReferenceSearchingAccessor,
+        tuple[int, dict[etree._Element, list[etree._Element]]],
+    ]
     _constructed: bool
 
     def __init__(
@@ -102,6 +111,8 @@ class MelodyModel:
             | None
         ) = None,
         diagram_cache_subdir: str | pathlib.PurePosixPath | None = None,
+        render_cache: str | os.PathLike | None = None,
+        render_cache_max_size: int = _render_cache.DEFAULT_MAX_SIZE,
         jupyter_untrusted: bool = False,
         **kwargs: t.Any,
     ) -> None:
@@ -208,6 +219,39 @@ class MelodyModel:
             A sub-directory prefix to prepend to diagram UUIDs before
             looking them up in the ``diagram_cache``.
 
+            *This argument is **not** passed to the file handler.*
+        render_cache: str | pathlib.Path
+            A local directory to store diagrams in after rendering them.
+            Unlike the ``diagram_cache``, entries are looked up by a
+            hash of everything that influences the rendered output,
+            i.e. the diagram's contents in the ``.aird`` file, the
+            semantic elements shown on it (including their children),
+            the attributes of any element that these link to, the
+            output format and the render parameters. Changes to
+            elements that are only reachable over more than one link
+            are not detected. The same directory can be shared between
+            models, processes and CI runs. If a diagram is found in both
+            caches, the ``diagram_cache`` takes precedence.
+
+            *This argument is **not** passed to the file handler.*
+        render_cache_max_size: int
+            The maximum size of the ``render_cache`` in bytes. When
+            storing a new diagram would exceed it, the least recently
+            used entries are removed.
+
+            *This argument is **not** passed to the file handler.*
+        load_workers: int
+            If greater than zero, fetch and parse the model's fragments
+            concurrently with this many threads. See
+            :class:`~capellambse.loader.core.MelodyLoader` for details.
+
+            *This argument is **not** passed to the file handler.*
+        index_cache: str | pathlib.Path
+            A local directory where the indexes of loaded fragments are
+            stored, so that reopening an unchanged model can skip
+            rebuilding them. See
+            :class:`~capellambse.loader.core.MelodyLoader` for details.
+
             *This argument is **not** passed to the file handler.*
         jupyter_untrusted: bool
             If set to True, restricts or disables some features that are
@@ -233,6 +277,10 @@ class MelodyModel:
 
         self._constructed = False
         self._loader = loader.MelodyLoader(path, **kwargs)
+        self._class_cache = (self._loader.generation, {})
+        self._proxy_cache = weakref.WeakValueDictionary()
+        self._reference_index = {}
+        self._diagram_descriptors = None
         self.jupyter_untrusted = jupyter_untrusted
 
         try:
@@ -261,6 +309,11 @@ class MelodyModel:
                 diagram_cache_subdir or "."
             )
 
+        if render_cache is not None:
+            self._render_cache = _render_cache.RenderCache(
+                render_cache, render_cache_max_size
+            )
+
         self._constructed = True
 
     @property
@@ -277,16 +330,24 @@ class MelodyModel:
     def _model(self) -> MelodyModel:
         return self
 
-    def save(self, **kw: t.Any) -> None:
+    def save(self, **kw: t.Any) -> list[pathlib.PurePosixPath]:
         # pylint: disable=line-too-long
         """Save the model back to where it was loaded from.
 
+        Only the fragments that were modified since loading the model
+        (or since the last save) are written back.
+
         Parameters
         ----------
         kw
             Additional keyword arguments accepted by the file handler in
             use. Please see the respective documentation for more info.
 
+        Returns
+        -------
+        list[pathlib.PurePosixPath]
+            The names of the fragments that were written.
+
         See Also
         --------
         capellambse.filehandler.localfilehandler.LocalFileHandler.write_transaction :
@@ -303,7 +364,7 @@ class MelodyModel:
         always leave the ``update_cache`` parameter at its default value
         of ``True`` if you intend to save changes.
         """
-        self._loader.save(**kw)
+        return self._loader.save(**kw)
 
     def search(
         self,
@@ -331,6 +392,11 @@ class MelodyModel:
             nested) children of this element. This option takes into
             account model fragmentation, but it does not treat link
             elements specially.
+
+        Returns
+        -------
+        ElementList
+            The matching elements, in document order.
         """
         xtypes_: list[str] = []
         for i in xtypes:
@@ -356,9 +422,12 @@ class MelodyModel:
         matches = self._loader.iterall_xt(*xtypes_, trees=trees)
         if below is not None:
             matches = (
-                i for i in matches if below._element in i.iterancestors()
+                i
+                for i in matches
+                if self._loader.is_descendant(i, below._element)
             )
-        return cls(self, list(matches), common.GenericElement)
+        matches = self._loader.sort_document_order(matches)
+        return cls(self, matches, common.GenericElement)
 
     def by_uuid(self, uuid: str) -> common.GenericElement:
         """Search the entire model for an element with the given UUID."""
@@ -398,14 +467,7 @@ class MelodyModel:
             if not capellambse.helpers.is_uuid_string(uuid):
                 raise ValueError(f"Malformed or missing UUID for {target!r}")
 
-        for elem in self._loader.xpath(
-            f"//*[@*[contains(., '#{uuid}')] | */@*[contains(., '#{uuid}')]]",
-            roots=[
-                i.root
-                for i in self._loader.trees.values()
-                if i.fragment_type != loader.FragmentType.VISUAL
-            ],
-        ):
+        for elem in self._loader.find_references(uuid):
             obj = GenericElement.from_model(self, elem)
             for attr in _reference_attributes(type(obj)):
                 if attr.startswith("_"):
@@ -432,6 +494,7 @@ class MelodyModel:
         *,
         create_index: bool = False,
         force: t.Literal["docker", "exe"] | None = None,
+        incremental: bool = False,
     ) -> None:
         r"""Update the diagram cache if one has been specified.
 
@@ -510,6 +573,18 @@ class MelodyModel:
             ``capella_cli`` as local executable, ``"docker"`` always
             interprets it as a docker image name. ``None`` (the default)
             enables automatic detection.
+        incremental
+            If ``True``, keep the existing diagram cache and only
+            replace the images of diagrams that changed since the last
+            update. Each diagram's ``.aird`` data and the semantic
+            elements it shows are fingerprinted, and the fingerprints
+            are stored in a ``manifest.json`` file in the cache. If no
+            diagram changed, the Capella CLI is not run at all. Images
+            of deleted diagrams are removed from the cache.
+
+            Fingerprints are only calculated in incremental mode, so
+            the first incremental update after a full one exports all
+            diagrams again.
 
         Raises
         ------
@@ -559,13 +634,22 @@ class MelodyModel:
                 "Cannot update: No diagram_cache was specified for this model"
             )
         diag_cache_dir = pathlib.Path(self._diagram_cache.path)
-        if diag_cache_dir.exists():
+        if not incremental and diag_cache_dir.exists():
             shutil.rmtree(diag_cache_dir)
             diag_cache_dir.mkdir(parents=True)
         capella_version = self.info.capella_version
         assert capella_version is not None
         assert re.fullmatch(r"\d+\.\d+\.\d+", capella_version)
         assert self.info.title is not None
+        diagrams = list(self.diagrams)
+        fingerprints: dict[str, str] | None = None
+        if incremental:
+            fingerprints = {
+                i.uuid: _render_cache.diagram_fingerprint(
+                    self._loader, i._element
+                )
+                for i in diagrams
+            }
         diagram_cache = _diagram_cache.DiagramCache(
             capella_cli.replace("{VERSION}", str(self.info.capella_version)),
             image_format,
@@ -573,7 +657,19 @@ class MelodyModel:
             force,
             self.info.title,
             diag_cache_dir,
-            list(self.diagrams),
+            diagrams,
+            fingerprints,
+            incremental=incremental,
+        )
+        if not diagram_cache.outdated:
+            LOGGER.info("Diagram cache is up to date, skipping export")
+            diagram_cache.finish()
+            return
+
+        LOGGER.debug(
+            "Exporting %d of %d diagrams",
+            len(diagram_cache.outdated),
+            len(diagrams),
         )
         with self._loader.write_tmp_project_dir() as tmp_project_dir:
             diagram_cache.export_diagrams(tmp_project_dir)
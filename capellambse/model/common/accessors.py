@@ -637,6 +637,7 @@ class DirectProxyAccessor(WritableAccessor[T], PhysicalAccessor[T]):
                     acc = getattr(type(ref), attr)
                     if acc is self or not isinstance(acc, WritableAccessor):
                         continue
+                    model._loader.mark_dirty(ref._element)
                     stack.enter_context(acc.purge_references(ref, obj))
 
             for elm in elements:
@@ -705,8 +706,21 @@ class DirectProxyAccessor(WritableAccessor[T], PhysicalAccessor[T]):
     ) -> None:
         if value._model is not elmlist._model:
             raise ValueError("Cannot move elements between models")
+        parent = elmlist._parent._element
+        if index > 0:
+            # Fast path: Avoid the linear search for the predecessor's
+            # position in the parent element
+            predecessor = elmlist._elements[index - 1]
+            if (
+                predecessor is not value._element
+                and predecessor.getparent() is parent
+            ):
+                predecessor.addnext(value._element)
+                elmlist._model._loader.idcache_index(value._element)
+                return
+
         try:
-            indexof = elmlist._parent._element.index
+            indexof = parent.index
             if index > 0:
                 parent_index = indexof(elmlist._elements[index - 1]) + 1
             elif index < -1:
@@ -955,6 +969,7 @@ class LinkAccessor(WritableAccessor[T], PhysicalAccessor[T]):
                 parent = ref.getparent()
                 if parent is None:
                     continue
+                obj._model._loader.mark_dirty(parent)
                 parent.remove(ref)
             except Exception:
                 LOGGER.exception("Cannot purge dangling ref object %r", ref)
@@ -1029,6 +1044,7 @@ class AttrProxyAccessor(WritableAccessor[T], PhysicalAccessor[T]):
         if getattr(obj, "_constructed", True):
             sys.audit("capellambse.delete", obj, self.__name__, None)
 
+        obj._model._loader.mark_dirty(obj._element)
         del obj._element.attrib[self.attr]
 
     def insert(
@@ -1061,6 +1077,7 @@ class AttrProxyAccessor(WritableAccessor[T], PhysicalAccessor[T]):
                 )
             link = obj._model._loader.create_link(obj._element, value._element)
             parts.append(link)
+        obj._model._loader.mark_dirty(obj._element)
         obj._element.set(self.attr, " ".join(parts))
 
     @contextlib.contextmanager
@@ -1088,6 +1105,7 @@ class AttrProxyAccessor(WritableAccessor[T], PhysicalAccessor[T]):
             sys.audit("capellambse.delete", obj, self.__name__, None)
             yield
             try:
+                obj._model._loader.mark_dirty(obj._element)
                 del obj._element.attrib[self.attr]
             except KeyError:
                 pass
@@ -1353,6 +1371,7 @@ class _Specification(t.MutableMapping[str, str]):
         k = self._aliases.get(k, k)
         i, lang_elem = self._index_of(k)
         body_elem = self._body_at(k, i)
+        self._model._loader.mark_dirty(self._element)
         self._element.remove(lang_elem)
         self._element.remove(body_elem)
 
@@ -1375,6 +1394,7 @@ class _Specification(t.MutableMapping[str, str]):
         k = self._aliases.get(k, k)
         if k in self._linked_text:
             v = helpers.escape_linked_text(self._model._loader, v)
+        self._model._loader.mark_dirty(self._element)
         try:
             i, lang = self._index_of(k)
         except KeyError:
@@ -1486,22 +1506,47 @@ class ReferenceSearchingAccessor(PhysicalAccessor[T]):
         if obj is None:  # pragma: no cover
             return self
 
-        matches: list[etree._Element] = []
-        for candidate in obj._model.search(*self.target_classes):
+        matches = self._get_index(obj._model).get(obj._element, ())
+        return self._make_list(obj, list(matches))
+
+    def _get_index(
+        self, model: capellambse.MelodyModel
+    ) -> dict[etree._Element, list[etree._Element]]:
+        """Get the inverse index of the searched attributes.
+
+        The index maps each referenced element to the candidates that
+        reference it through any of the :attr:`attrs`, in the order in
+        which :meth:`~capellambse.model.MelodyModel.search` returns
+        them. It is built with a single scan over all candidates, and is
+        rebuilt whenever the loader's :attr:`~.MelodyLoader.mutations`
+        counter changes, i.e. after any change made through the model.
+        """
+        stamp = model._loader.mutations
+        try:
+            cached_stamp, index = model._reference_index[self]
+        except KeyError:
+            pass
+        else:
+            if cached_stamp == stamp:
+                return index
+
+        index = {}
+        for candidate in model.search(*self.target_classes):
+            targets: dict[etree._Element, None] = {}
             for attr in self.attrs:
                 try:
                     value = attr(candidate)
                 except AttributeError:
                     continue
-                if (
-                    isinstance(value, element.ElementList)
-                    and obj in value
-                    or isinstance(value, element.GenericElement)
-                    and obj == value
-                ):
-                    matches.append(candidate._element)
-                    break
-        return self._make_list(obj, matches)
+                if isinstance(value, element.ElementList):
+                    targets.update(dict.fromkeys(value._elements))
+                elif isinstance(value, element.GenericElement):
+                    targets[value._element] = None
+            for target in targets:
+                index.setdefault(target, []).append(candidate._element)
+
+        model._reference_index[self] = (stamp, index)
+        return index
 
 
 class RoleTagAccessor(PhysicalAccessor):
@@ -1614,6 +1659,7 @@ class ElementListCouplingMixin(element.ElementList[T], t.Generic[T]):
                 f"Cannot set: List must stay at length {self.fixed_length}"
             )
 
+        self._parent._model._loader.mark_dirty(self._parent._element)
         accessor.__set__(self._parent, new_objs)
 
     def __delitem__(self, index: int | slice) -> None:
@@ -1625,6 +1671,7 @@ class ElementListCouplingMixin(element.ElementList[T], t.Generic[T]):
         assert isinstance(accessor, WritableAccessor)
         if not isinstance(index, slice):
             index = slice(index, index + 1 or None)
+        self._parent._model._loader.mark_dirty(self._parent._element)
         for obj in self[index]:
             sys.audit(
                 "capellambse.delete",
@@ -1672,6 +1719,7 @@ class ElementListCouplingMixin(element.ElementList[T], t.Generic[T]):
         acc = type(self)._accessor
         assert isinstance(acc, WritableAccessor)
         newobj = acc.create(self, *type_hints, **kw)
+        self._parent._model._loader.mark_dirty(self._parent._element)
         try:
             sys.audit("capellambse.create", self._parent, acc.__name__, newobj)
             acc.insert(self, len(self), newobj)
@@ -1701,6 +1749,7 @@ class ElementListCouplingMixin(element.ElementList[T], t.Generic[T]):
         acc = type(self)._accessor
         assert isinstance(acc, WritableAccessor)
         newobj = acc.create_singleattr(self, arg)
+        self._parent._model._loader.mark_dirty(self._parent._element)
         try:
             sys.audit("capellambse.create", self._parent, acc.__name__, newobj)
             acc.insert(self, len(self), newobj)
@@ -1731,5 +1780,6 @@ class ElementListCouplingMixin(element.ElementList[T], t.Generic[T]):
             sys.audit(
                 "capellambse.insert", self._parent, acc.__name__, index, value
             )
+        self._parent._model._loader.mark_dirty(self._parent._element)
         acc.insert(self, index, value)
         super().insert(index, value)
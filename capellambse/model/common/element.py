@@ -32,6 +32,8 @@ from . import XTYPE_HANDLERS, T, U, accessors, properties
 
 _NOT_SPECIFIED = object()
 "Used to detect unspecified optional arguments"
+_INDEXABLE_KEY_TYPES = frozenset({str, int, type(None)})
+"""Types of keys that hash consistently with their equality comparison."""
 
 
 def attr_equal(attr: str) -> cabc.Callable[[type[T]], type[T]]:
@@ -80,6 +82,44 @@ def attr_equal(attr: str) -> cabc.Callable[[type[T]], type[T]]:
     return add_wrapped_eq
 
 
+def _find_class(
+    model: capellambse.MelodyModel, element: etree._Element
+) -> type[GenericElement]:
+    """Find the most specific proxy class for ``element``.
+
+    The resolved classes are memoized on the model, and the memo is
+    discarded whenever the loader's :attr:`generation` changes.
+    """
+    generation, classes = model._class_cache
+    if generation != model._loader.generation:
+        classes = {}
+        model._class_cache = (model._loader.generation, classes)
+    try:
+        return classes[element]
+    except KeyError:
+        pass
+
+    class_ = GenericElement
+    xtype = helpers.xtype_of(element)
+    if xtype is not None:
+        ancestors = model._loader.iterancestors(element)
+        for ancestor in ancestors:
+            anc_xtype = helpers.xtype_of(ancestor)
+            try:
+                class_ = XTYPE_HANDLERS[anc_xtype][xtype]
+            except KeyError:
+                pass
+            else:
+                break
+        else:
+            try:
+                class_ = XTYPE_HANDLERS[None][xtype]
+            except KeyError:
+                pass
+    classes[element] = class_
+    return class_
+
+
 class ModelObject(t.Protocol):
     """A class that wraps a specific model object.
 
@@ -143,7 +183,7 @@ class GenericElement:
     summary = properties.HTMLAttributeProperty("summary", optional=True)
     diagrams: accessors.Accessor[capellambse.model.diagram.Diagram]
     diagrams = property(  # type: ignore[assignment]
-        lambda self: self._model.diagrams.by_target_uuid(self.uuid)
+        lambda self: type(self._model).diagrams.for_target(self)
     )
 
     constraints: accessors.Accessor
@@ -182,26 +222,15 @@ class GenericElement:
         """
         class_ = cls
         if class_ is GenericElement:
-            xtype = helpers.xtype_of(element)
-            if xtype is not None:
-                ancestors = model._loader.iterancestors(element)
-                for ancestor in ancestors:
-                    anc_xtype = helpers.xtype_of(ancestor)
-                    try:
-                        class_ = XTYPE_HANDLERS[anc_xtype][xtype]
-                    except KeyError:
-                        pass
-                    else:
-                        break
-                else:
-                    try:
-                        class_ = XTYPE_HANDLERS[None][xtype]
-                    except KeyError:
-                        pass
+            class_ = _find_class(model, element)
+        self = model._proxy_cache.get(element)
+        if type(self) is class_:  # pylint: disable=unidiomatic-typecheck
+            return self
         self = class_.__new__(class_)
         self._model = model
         self._element = element
         self._constructed = True
+        model._proxy_cache[element] = self
         return self
 
     def __init__(
@@ -229,6 +258,7 @@ class GenericElement:
         self._constructed = False
         self._model = model
         self._element: etree._Element = etree.Element(self._xmltag)
+        self._model._loader.mark_dirty(parent)
         parent.append(self._element)
         try:
             for key, val in kw.items():
@@ -250,16 +280,37 @@ class GenericElement:
         except BaseException:
             parent.remove(self._element)
             raise
+        self._model._proxy_cache[self._element] = self
         self._constructed = True
 
     def __setattr__(self, attr: str, value: t.Any) -> None:
-        if attr.startswith("_") or hasattr(type(self), attr):
+        if attr.startswith("_"):
             super().__setattr__(attr, value)
+        elif hasattr(type(self), attr):
+            loader = self._model._loader
+            loader.mark_dirty(self._element)
+            try:
+                super().__setattr__(attr, value)
+            finally:
+                # Invalidate caches that the setter itself may have built
+                loader.mutations += 1
         else:
             raise AttributeError(
                 f"{attr!r} isn't defined on {type(self).__name__}"
             )
 
+    def __delattr__(self, attr: str) -> None:
+        if attr.startswith("_"):
+            super().__delattr__(attr)
+            return
+
+        loader = self._model._loader
+        loader.mark_dirty(self._element)
+        try:
+            super().__delattr__(attr)
+        finally:
+            loader.mutations += 1
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, type(self)):
             return NotImplemented
@@ -384,6 +435,8 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
     __slots__ = (
         "_elemclass",
         "_elements",
+        "_ElementList__indexstamp",
+        "_ElementList__indices",
         "_ElementList__mapkey",
         "_ElementList__mapvalue",
         "_model",
@@ -448,6 +501,39 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
 
             return self._positive == (value in valueset)
 
+        def find_indices(self, valueset: cabc.Container[U]) -> list[int]:
+            """Find the positions of all matching elements.
+
+            If possible, this uses the parent list's key index (see
+            :meth:`ElementList._key_index`) instead of calling
+            :meth:`ismatch` on every element.
+            """
+            if (
+                type(self).ismatch is ElementList._Filter.ismatch
+                and isinstance(valueset, cabc.Iterable)
+                and all(type(i) in _INDEXABLE_KEY_TYPES for i in valueset)
+            ):
+                index = self._parent._key_index(
+                    (type(self), self._attr), self.extract_key
+                )
+            else:
+                index = None
+
+            if index is None:
+                return [
+                    i
+                    for i, elm in enumerate(self._parent)
+                    if self.ismatch(elm, valueset)
+                ]
+
+            keys, valid = index
+            matches: set[int] = set()
+            for value in set(valueset):  # type: ignore[call-overload]
+                matches.update(keys.get(value, ()))
+            if self._positive:
+                return sorted(matches)
+            return [i for i in valid if i not in matches]
+
         def __call__(
             self, *values: U, single: bool | None = None
         ) -> T | ElementList[T]:
@@ -464,12 +550,8 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
             if single is None:
                 single = self._single
             valueset = self.make_values_container(*values)
-            indices = []
-            elements = []
-            for i, elm in enumerate(self._parent):
-                if self.ismatch(elm, valueset):
-                    indices.append(i)
-                    elements.append(self._parent._elements[i])
+            indices = self.find_indices(valueset)
+            elements = [self._parent._elements[i] for i in indices]
 
             if not single:
                 return self._parent._newlist(elements)
@@ -501,10 +583,7 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
 
         def __contains__(self, value: U) -> bool:
             valueset = self.make_values_container(value)
-            for elm in self._parent:
-                if self.ismatch(elm, valueset):
-                    return True
-            return False
+            return bool(self.find_indices(valueset))
 
         def __getattr__(self, attr: str) -> ElementList._Filter[U]:
             if attr.startswith("_"):
@@ -528,6 +607,10 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
         # pylint: disable=assigning-non-slot # false-positive
         self._model = model
         self._elements = elements
+        self.__indices: dict[
+            t.Hashable, tuple[dict[t.Any, list[int]], list[int]] | None
+        ] = {}
+        self.__indexstamp: tuple[int, int] | None = None
         if elemclass is not None:
             self._elemclass = elemclass
         else:
@@ -664,6 +747,7 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
 
     def __delitem__(self, index: int | slice) -> None:
         del self._elements[index]
+        self.__indices.clear()
 
     def __getattr__(
         self,
@@ -762,7 +846,13 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
         if self.__mapkey is None or self.__mapvalue is None:
             raise TypeError("This list cannot act as a mapping")
 
-        candidates = [i for i in self if self.__mapkey(i) == key]
+        index = None
+        if type(key) in _INDEXABLE_KEY_TYPES:
+            index = self._key_index("\0mapkey", self.__mapkey)
+        if index is not None and len(index[1]) == len(self):
+            candidates = [self[i] for i in index[0].get(key, ())]
+        else:
+            candidates = [i for i in self if self.__mapkey(i) == key]
         if len(candidates) > 1:
             raise ValueError(f"Multiple matches for key {key!r}")
         if not candidates:
@@ -786,6 +876,61 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
 
         setattr(target, key[-1], value)
 
+    def _key_index(
+        self, name: t.Hashable, extract_key: cabc.Callable[[T], t.Any]
+    ) -> tuple[dict[t.Any, list[int]], list[int]] | None:
+        """Get a hash index over the keys that ``extract_key`` returns.
+
+        The index is built on first use and cached on this list. It is
+        discarded when the list is modified, or when the loader's
+        :attr:`~capellambse.loader.core.MelodyLoader.mutations` counter
+        changes. Changes made directly on the XML elements are only
+        detected if they are announced with
+        :meth:`~capellambse.loader.core.MelodyLoader.mark_dirty`.
+
+        Parameters
+        ----------
+        name
+            A unique name for the index.
+        extract_key
+            Callable that extracts the key from a list member.
+
+        Returns
+        -------
+        tuple[dict[typing.Any, list[int]], list[int]] | None
+            A mapping from each key to the positions of the members
+            having it, and the positions of all members for which a key
+            could be extracted. ``None`` if some of the keys are of a
+            type that cannot safely be hashed.
+        """
+        stamp = (self._model._loader.mutations, len(self._elements))
+        if self.__indexstamp != stamp:
+            self.__indices.clear()
+            self.__indexstamp = stamp
+
+        try:
+            return self.__indices[name]
+        except KeyError:
+            pass
+
+        keys: dict[t.Any, list[int]] | None = {}
+        valid: list[int] = []
+        for i, elm in enumerate(self):
+            try:
+                key = extract_key(elm)
+            except AttributeError:
+                continue
+            if type(key) not in _INDEXABLE_KEY_TYPES:
+                keys = None
+                break
+            assert keys is not None
+            keys.setdefault(key, []).append(i)
+            valid.append(i)
+
+        index = (keys, valid) if keys is not None else None
+        self.__indices[name] = index
+        return index
+
     def _newlist(self, elements: list[etree._Element]) -> ElementList[T]:
         listtype = self._newlist_type()
         return listtype(self._model, elements, self._elemclass)
@@ -810,6 +955,7 @@ class ElementList(cabc.MutableSequence, t.Generic[T]):
     def insert(self, index: int, value: T) -> None:
         elm: etree._Element = value._element
         self._elements.insert(index, elm)
+        self.__indices.clear()
 
     def items(self) -> ElementListMapItemsView[T]:
         return ElementListMapItemsView(self)
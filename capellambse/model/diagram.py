@@ -7,18 +7,23 @@ from __future__ import annotations
 import abc
 import base64
 import collections.abc as cabc
+import concurrent.futures as cf
 import importlib.metadata as imm
 import logging
+import multiprocessing
 import operator
 import os
+import pathlib
+import time
 import traceback
 import typing as t
 import uuid
 
 import markupsafe
+from lxml import etree
 
 import capellambse
-from capellambse import aird, diagram, helpers, svg
+from capellambse import _render_cache, aird, diagram, helpers, svg
 
 from . import common as c
 from . import modeltypes
@@ -73,6 +78,8 @@ class AbstractDiagram(metaclass=abc.ABCMeta):
     _model: capellambse.MelodyModel
     _render: diagram.Diagram
     _error: BaseException
+    _render_cache_key_used: str
+    _render_cache_keys: tuple[int, dict[tuple[str, str], str | None]]
     _last_render_params: dict[str, t.Any] = {}
     """Additional rendering parameters for the cached rendered diagram.
 
@@ -247,11 +254,29 @@ class AbstractDiagram(metaclass=abc.ABCMeta):
         except KeyError:
             pass
 
+        render_cache = getattr(self._model, "_render_cache", None)
+        cache_key: str | None = None
+        if render_cache is not None and fmt is not None:
+            cache_key = self.__get_render_cache_key(fmt, params)
+        if cache_key is not None:
+            try:
+                return render_cache.get(cache_key)
+            except KeyError:
+                pass
+            if getattr(self, "_render_cache_key_used", None) != cache_key:
+                # The diagram changed since it was last rendered
+                self.invalidate_cache()
+                self._render_cache_key_used = cache_key
+
         render = self.__render_fresh(params)
         if isinstance(conv, DiagramFormat):
-            return conv.convert(render)
+            result = conv.convert(render)
         else:
-            return conv(render)
+            result = conv(render)
+
+        if cache_key is not None:
+            render_cache.put(cache_key, result)
+        return result
 
     @abc.abstractmethod
     def _create_diagram(self, params: dict[str, t.Any]) -> diagram.Diagram:
@@ -261,6 +286,42 @@ class AbstractDiagram(metaclass=abc.ABCMeta):
         method, as it handles caching of the results.
         """
 
+    def _render_cache_key(
+        self, fmt: str, params: dict[str, t.Any]
+    ) -> str | None:
+        """Calculate the key for storing this diagram in the render cache.
+
+        The key must change whenever anything that affects the rendered
+        output changes. Returning None (the default) disables the
+        render cache for this diagram.
+        """
+        del fmt, params
+        return None
+
+    def __get_render_cache_key(
+        self, fmt: str, params: dict[str, t.Any]
+    ) -> str | None:
+        """Get the render cache key, reusing it while the model is unchanged.
+
+        Calculated keys are remembered until the loader's
+        :attr:`~capellambse.loader.core.MelodyLoader.mutations` counter
+        changes, so that repeatedly rendering an unchanged model does
+        not hash the diagram's contents every time.
+        """
+        mutations = self._model._loader.mutations
+        stamp, keys = getattr(self, "_render_cache_keys", (None, {}))
+        if stamp != mutations:
+            keys = {}
+            self._render_cache_keys = (mutations, keys)
+
+        memo_key = (fmt, repr(sorted(params.items())))
+        try:
+            return keys[memo_key]
+        except KeyError:
+            pass
+        cache_key = keys[memo_key] = self._render_cache_key(fmt, params)
+        return cache_key
+
     def __create_error_image(
         self, stage: str, error: Exception
     ) -> diagram.Diagram:
@@ -430,6 +491,155 @@ class Diagram(AbstractDiagram):
     def _create_diagram(self, params: dict[str, t.Any]) -> diagram.Diagram:
         return aird.parse_diagram(self._model._loader, self._element, **params)
 
+    def _render_cache_key(
+        self, fmt: str, params: dict[str, t.Any]
+    ) -> str | None:
+        return _render_cache.diagram_key(
+            self._model._loader, self._element, fmt, params
+        )
+
+
+class DiagramDescriptorTable(t.NamedTuple):
+    """All diagram descriptors of a model, indexed by their target."""
+
+    generation: int
+    """The loader generation that the table was built for."""
+    descriptors: list[aird.DiagramDescriptor]
+    by_target: dict[etree._Element, list[aird.DiagramDescriptor]]
+
+
+def get_descriptor_table(
+    model: capellambse.MelodyModel,
+) -> DiagramDescriptorTable:
+    """Get the table of diagram descriptors in the model.
+
+    The table is built on first use and stored on the model. It is
+    rebuilt whenever the loader's ``generation`` counter changes, as
+    diagrams or their target elements may have been added or removed.
+    """
+    table = model._diagram_descriptors
+    if table is not None and table.generation == model._loader.generation:
+        return table
+
+    descriptors = list(aird.enumerate_diagrams(model._loader))
+    by_target: dict[etree._Element, list[aird.DiagramDescriptor]] = {}
+    for descriptor in descriptors:
+        by_target.setdefault(descriptor.target, []).append(descriptor)
+    table = DiagramDescriptorTable(
+        model._loader.generation, descriptors, by_target
+    )
+    model._diagram_descriptors = table
+    return table
+
+
+class RenderResult(t.NamedTuple):
+    """The outcome of rendering a single diagram in a batch."""
+
+    uuid: str
+    """The UUID of the rendered diagram."""
+    duration: float
+    """The time it took to render the diagram, in seconds."""
+    result: t.Any
+    """The rendered diagram, or the file it was written to.
+
+    This is None if rendering failed.
+    """
+    error: BaseException | None
+    """The exception that occurred during rendering, if any."""
+
+
+class DiagramList(c.CachedElementList[Diagram]):
+    """A list of diagrams that supports rendering them in bulk."""
+
+    def render_all(
+        self,
+        fmt: str,
+        /,
+        sink: str | os.PathLike | None = None,
+        *,
+        workers: int = 0,
+        **params: t.Any,
+    ) -> list[RenderResult]:
+        """Render all diagrams in this list.
+
+        Parameters
+        ----------
+        fmt
+            The output format, like for :meth:`AbstractDiagram.render`.
+        sink
+            A directory to write the rendered diagrams to. Each diagram
+            is written as soon as it is finished, to a file named after
+            its UUID and the format's ``filename_extension``. If not
+            given, the rendered diagrams are returned instead.
+        workers
+            If greater than zero, render the diagrams concurrently in a
+            pool with this many worker processes. The workers are forked
+            from the current process, and thus share a read-only
+            snapshot of the loaded model. Changes made to the model
+            while rendering are not visible to them. On platforms that
+            do not support forking, the diagrams are rendered
+            sequentially instead.
+        params
+            Additional rendering parameters that are passed on to each
+            diagram's :meth:`~AbstractDiagram.render` method.
+
+        Returns
+        -------
+        list[RenderResult]
+            The results for all diagrams, in the order of this list.
+            Diagrams that failed to render are reported with their
+            exception instead of stopping the batch.
+        """
+        conv = _find_format_converter(fmt)
+        if sink is not None:
+            ext = getattr(conv, "filename_extension", None)
+            if ext is None:
+                raise ValueError(f"Cannot write {fmt!r} output to files")
+            sink = pathlib.Path(sink)
+            sink.mkdir(parents=True, exist_ok=True)
+
+        results: dict[int, RenderResult] = {}
+
+        def finish(index: int, result: RenderResult) -> None:
+            if sink is not None and result.error is None:
+                path = sink / f"{result.uuid}{ext}"
+                if isinstance(result.result, str):
+                    path.write_text(result.result, encoding="utf-8")
+                else:
+                    path.write_bytes(result.result)
+                result = result._replace(result=path)
+            LOGGER.debug(
+                "Rendered diagram %s in %.3fs", result.uuid, result.duration
+            )
+            results[index] = result
+
+        if workers > 0 and "fork" in multiprocessing.get_all_start_methods():
+            with cf.ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_render_worker,
+                initargs=(self,),
+            ) as pool:
+                futures = {
+                    pool.submit(_render_in_worker, i, fmt, params): i
+                    for i in range(len(self))
+                }
+                for future in cf.as_completed(futures):
+                    index = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as err:
+                        uuid_ = self._elements[index].uid
+                        result = RenderResult(uuid_, 0.0, None, err)
+                    finish(index, result)
+        else:
+            if workers > 0:
+                LOGGER.debug("Cannot fork, rendering diagrams sequentially")
+            for i in range(len(self)):
+                finish(i, _render_one(self, i, fmt, params))
+
+        return [results[i] for i in range(len(self))]
+
 
 class DiagramAccessor(c.Accessor):
     """Provides access to a list of diagrams below the specified viewpoint."""
@@ -449,17 +659,29 @@ class DiagramAccessor(c.Accessor):
         if obj is None:  # pragma: no cover
             return self
 
-        if self.viewpoint is None:
-            descriptors = list(aird.enumerate_diagrams(obj._model._loader))
-        else:
+        table = get_descriptor_table(obj._model)
+        return self._make_list(obj._model, table.descriptors)
+
+    def for_target(self, target: c.GenericElement) -> DiagramList:
+        """Get the diagrams of this accessor that show ``target``."""
+        table = get_descriptor_table(target._model)
+        descriptors = table.by_target.get(target._element, [])
+        return self._make_list(target._model, descriptors)
+
+    def _make_list(
+        self,
+        model: capellambse.MelodyModel,
+        descriptors: list[aird.DiagramDescriptor],
+    ) -> DiagramList:
+        if self.viewpoint is not None:
             descriptors = [
-                d
-                for d in aird.enumerate_diagrams(obj._model._loader)
-                if d.viewpoint == self.viewpoint
+                d for d in descriptors if d.viewpoint == self.viewpoint
             ]
-        return c.CachedElementList(
-            obj._model,
-            descriptors,
+        else:
+            descriptors = list(descriptors)
+        return DiagramList(
+            model,
+            descriptors,  # type: ignore[arg-type]
             Diagram,
             cacheattr=self.cacheattr,
         )
@@ -507,8 +729,7 @@ def convert_svgdiagram(
     dg: diagram.Diagram,
 ) -> svg.generate.SVGDiagram:
     """Convert the diagram to a SVGDiagram."""
-    jsondata = diagram.DiagramJSONEncoder().encode(dg)
-    return svg.generate.SVGDiagram.from_json(jsondata)
+    return svg.generate.SVGDiagram.from_diagram(dg)
 
 
 class ConfluenceSVGFormat:
@@ -652,3 +873,31 @@ def _iter_format_converters() -> t.Iterator[DiagramConverter]:
             pass
         else:
             yield conv
+
+
+_render_worker_diagrams: DiagramList | None = None
+
+
+def _init_render_worker(diagrams: DiagramList) -> None:
+    global _render_worker_diagrams
+    _render_worker_diagrams = diagrams
+
+
+def _render_in_worker(
+    index: int, fmt: str, params: dict[str, t.Any]
+) -> RenderResult:
+    assert _render_worker_diagrams is not None
+    return _render_one(_render_worker_diagrams, index, fmt, params)
+
+
+def _render_one(
+    diagrams: DiagramList, index: int, fmt: str, params: dict[str, t.Any]
+) -> RenderResult:
+    # pylint: disable=broad-except
+    dg = diagrams[index]
+    start = time.perf_counter()
+    try:
+        result = dg.render(fmt, **params)
+    except Exception as err:
+        return RenderResult(dg.uuid, time.perf_counter() - start, None, err)
+    return RenderResult(dg.uuid, time.perf_counter() - start, result, None)
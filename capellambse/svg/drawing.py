@@ -5,7 +5,6 @@
 from __future__ import annotations
 
 import collections.abc as cabc
-import copy
 import dataclasses
 import logging
 import os
@@ -53,9 +52,20 @@ class Drawing:
         if metadata.class_:
             superparams["class_"] = re.sub(r"\s+", "", metadata.class_)
 
-        self.__drawing = drawing.Drawing(**superparams)
+        self.__drawing = drawing.Drawing(**superparams, debug=False)
+        self.__defs_ids: set[str | None] = set()
         self.diagram_class = metadata.class_
-        self.stylesheet = self.make_stylesheet()
+        self.__stylesheet: style.SVGStylesheet | None = None
+        self.__sheet = style.Style(text="")
+        self.__add_def(self.__sheet)
+        static_deco = style.STATIC_DECORATIONS["__GLOBAL__"]
+        static_deco += style.STATIC_DECORATIONS.get(
+            self.diagram_class or "", ()
+        )
+        for name in static_deco:
+            self.__add_def(decorations.deco_factories[name]())
+        self.__sheet_gradients: list[base.BaseElement] = []
+        self.__sheet_gradients_after = self.__drawing.defs.elements[-1]
         self.add_backdrop(pos=metadata.pos, size=metadata.size)
 
         self.obj_cache: dict[str | None, t.Any] = {}
@@ -76,12 +86,32 @@ class Drawing:
         taken.
         """
         kw["filename"] = filename or self.__drawing.filename
+        self.__update_stylesheet()
         return self.__drawing.saveas(**kw)
 
     def to_string(self) -> str:
         """Return a string representation of the SVG."""
+        self.__update_stylesheet()
         return self.__drawing.tostring()
 
+    @property
+    def stylesheet(self) -> style.SVGStylesheet:
+        """The stylesheet for the style classes used in the drawing.
+
+        The stylesheet is built when the drawing is first serialized,
+        and then kept until elements with new style classes are drawn.
+        """
+        return self.__update_stylesheet()
+
+    def __update_stylesheet(self) -> style.SVGStylesheet:
+        if (
+            self.__stylesheet is None
+            or self.__stylesheet.used_classes != self.__used_classes()
+        ):
+            self.make_stylesheet()
+        assert self.__stylesheet is not None
+        return self.__stylesheet
+
     def add_backdrop(
         self, pos: tuple[float, float], size: tuple[float, float]
     ) -> None:
@@ -95,18 +125,45 @@ class Drawing:
         self.__drawing.add(self.__backdrop)
 
     def make_stylesheet(self) -> style.SVGStylesheet:
-        """Return created stylesheet and add sheet and decorations to defs."""
-        stylesheet = style.SVGStylesheet(class_=self.diagram_class or "")
-        self.__drawing.defs.add(stylesheet.sheet)
+        """Return created stylesheet and add sheet and decorations to defs.
+
+        The stylesheet covers the style classes used so far, and
+        replaces the one that was previously added to the defs.
+        """
+        stylesheet = style.SVGStylesheet(
+            class_=self.diagram_class or "",
+            used_classes=self.__used_classes(),
+        )
+        self.__sheet.text = stylesheet.sheet.text
         for name in stylesheet.static_deco:
-            self.__drawing.defs.add(decorations.deco_factories[name]())
+            if name not in self.__defs_ids:
+                self.__add_def(decorations.deco_factories[name]())
 
-        for grad in stylesheet.yield_gradients():
-            self.__drawing.defs.add(grad)
+        defs = self.__drawing.defs.elements
+        for grad in self.__sheet_gradients:
+            defs.remove(grad)
+        self.__sheet_gradients = list(stylesheet.yield_gradients())
+        index = defs.index(self.__sheet_gradients_after) + 1
+        defs[index:index] = self.__sheet_gradients
 
+        self.__stylesheet = stylesheet
         return stylesheet
 
+    def __used_classes(self) -> set[str]:
+        used_classes: set[str] = set()
+        elements = list(self.__drawing.elements)
+        while elements:
+            elm = elements.pop()
+            used_classes.update(elm.attribs.get("class", "").split())
+            elements.extend(elm.elements)
+        return used_classes
+
+    def __add_def(self, element: base.BaseElement) -> None:
+        self.__drawing.defs.add(element)
+        self.__defs_ids.add(element.attribs.get("id"))
+
     def __repr__(self) -> str:
+        self.__update_stylesheet()
         return self.__drawing._repr_svg_()
 
     def add_rect(
@@ -332,7 +389,10 @@ class Drawing:
         for line in lines.lines:
             text.add(
                 svgtext.TSpan(
-                    insert=(x, y), text=line, **{"xml:space": "preserve"}
+                    insert=(x, y),
+                    text=line,
+                    debug=False,
+                    **{"xml:space": "preserve"},
                 )
             )
             y += lines.line_height
@@ -457,15 +517,15 @@ class Drawing:
         except AttributeError:
             raise ValueError(f'Invalid object type: {obj["type"]}') from None
 
-        mobj = copy.deepcopy(obj)
         objparams = {
             f"{k}_": v for k, v in obj.items() if k not in {"type", "style"}
         }
+        objtype: str = obj["type"]
         if obj["class"] in decorations.all_ports:
-            mobj["type"] = "box"  # type: ignore[index]
+            objtype = "box"
 
-        class_: str = mobj["type"].capitalize() + (
-            f".{mobj['class']}" if "class" in obj else ""
+        class_: str = objtype.capitalize() + (
+            f".{obj['class']}" if "class" in obj else ""
         )
         obj_style = style.Styling(
             self.diagram_class,
@@ -483,7 +543,7 @@ class Drawing:
             },
         )
 
-        self.obj_cache[mobj["id"]] = obj
+        self.obj_cache[obj["id"]] = obj
 
         drawfunc(**objparams, obj_style=obj_style, text_style=text_style)
 
@@ -491,21 +551,19 @@ class Drawing:
         self._deploy_defs(text_style)
 
     def _deploy_defs(self, styling: style.Styling) -> None:
-        defs_ids = {d.attribs.get("id") for d in self.__drawing.defs.elements}
         for attr in styling:
             val = getattr(styling, attr)
             if isinstance(val, cabc.Iterable) and not isinstance(
                 val, (str, diagram.RGB)
             ):
+                val = tuple(val)
                 grad_id = styling._generate_id("CustomGradient", val)
-                if grad_id not in defs_ids:
-                    gradient = symbols._make_lgradient(
-                        id_=grad_id, stop_colors=val
+                if grad_id not in self.__defs_ids:
+                    self.__add_def(
+                        symbols._make_lgradient(id_=grad_id, stop_colors=val)
                     )
-                    self.__drawing.defs.add(gradient)
-                    defs_ids.add(grad_id)
 
-        defaultstyles = diagram.get_style(self.diagram_class, styling._class)
+        defaultstyles = styling._defaultstyles
 
         def getstyleattr(sobj: object, attr: str) -> t.Any:
             return getattr(sobj, attr, None) or defaultstyles.get(
@@ -522,9 +580,9 @@ class Drawing:
 
             stroke = str(getstyleattr(styling, "stroke"))
             stroke_width = str(getstyleattr(styling, "stroke-width"))
-            marker_id = styling._generate_id(marker, [stroke])
-            if marker_id not in defs_ids:
-                self.__drawing.defs.add(
+            marker_id = styling._generate_id(marker, (stroke,))
+            if marker_id not in self.__defs_ids:
+                self.__add_def(
                     decorations.deco_factories[marker](
                         marker_id,
                         style=style.Styling(
@@ -536,7 +594,6 @@ class Drawing:
                         ),
                     )
                 )
-                defs_ids.add(marker_id)
 
     def _draw_symbol(
         self,
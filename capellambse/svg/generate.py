@@ -10,6 +10,7 @@ import os
 import pathlib
 import typing as t
 
+from capellambse import diagram
 from capellambse.svg.drawing import LabelDict
 
 ContentsDict = t.TypedDict(
@@ -88,6 +89,29 @@ class SVGDiagram:
         metadata = DiagramMetadata.from_dict(jsondict)
         return cls(metadata, jsondict["contents"])
 
+    @classmethod
+    def from_diagram(cls, dg: diagram.Diagram) -> SVGDiagram:
+        """Create an SVGDiagram directly from a :class:`~.diagram.Diagram`.
+
+        This produces the same result as encoding the diagram with the
+        :class:`~capellambse.diagram.DiagramJSONEncoder` and passing the
+        resulting string to :meth:`from_json`, but skips the round trip
+        through JSON.
+
+        Parameters
+        ----------
+        dg
+            The diagram to convert
+
+        Returns
+        -------
+        diagram
+            SVG diagram object
+        """
+        data = diagram.DiagramJSONEncoder().as_json_data(dg)
+        metadata = DiagramMetadata.from_dict(data)
+        return cls(metadata, data["contents"])
+
     @classmethod
     def from_json_path(cls, path: str | os.PathLike) -> SVGDiagram:
         """Create an SVGDiagram from the given JSON file.
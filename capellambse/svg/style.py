@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import functools
 import io
 import itertools
 import logging
@@ -180,7 +181,7 @@ class Styling:
 
     def __getattribute__(self, attr: str) -> str:
         if attr in {"marker-start", "marker-end"}:
-            defaultstyles = diagram.get_style(self._diagram_class, self._class)
+            defaultstyles = self._defaultstyles
             try:
                 value = super().__getattribute__(attr)
             except AttributeError as err:
@@ -198,6 +199,10 @@ class Styling:
 
         return super().__getattribute__(attr)
 
+    @functools.cached_property
+    def _defaultstyles(self) -> dict[str, t.Any]:
+        return diagram.get_style(self._diagram_class, self._class)
+
     def __bool__(self) -> bool:
         try:
             next(iter(self))
@@ -206,7 +211,7 @@ class Styling:
         return True
 
     def __iter__(self) -> cabc.Iterator[str]:
-        defaultstyles = diagram.get_style(self._diagram_class, self._class)
+        defaultstyles = self._defaultstyles
         for attr in ("marker-start", "marker-end"):
             if (
                 not self._marker
@@ -215,8 +220,10 @@ class Styling:
             ):
                 yield attr
 
-        yield from itertools.filterfalse(
-            operator.methodcaller("startswith", "_"), dir(self)
+        yield from sorted(
+            itertools.filterfalse(
+                operator.methodcaller("startswith", "_"), vars(self)
+            )
         )
 
     def __getitem__(self, attrs: str | cabc.Iterable[str]) -> str | None:
@@ -246,12 +253,7 @@ class Styling:
         name: str, value: cabc.Iterable[str | diagram.RGB]
     ) -> str:
         """Return unqiue identifier for given css-value."""
-        return "_".join(
-            itertools.chain(
-                (name,),
-                (diagram.RGB.fromcss(v).tohex() for v in value),
-            ),
-        )
+        return _generate_id(name, tuple(value))
 
     def __str__(self) -> str:
         return self[""] or ""
@@ -290,7 +292,19 @@ class Style(base.BaseElement):
 class SVGStylesheet:
     """CSS stylesheet for SVG."""
 
-    def __init__(self, class_: str):
+    def __init__(self, class_: str, used_classes: cabc.Set[str] | None = None):
+        """Initialize SVGStylesheet class.
+
+        Parameters
+        ----------
+        class_
+            The style class of the diagram.
+        used_classes
+            If given, only write the styles for these element style
+            classes (e.g. ``LogicalComponent``), and the styles that
+            apply to all elements of a type. By default, the styles for
+            all known classes are written.
+        """
         if not isinstance(class_, str):
             raise TypeError(
                 f"Invalid type for class_ '{type(class_).__name__}'. This"
@@ -298,6 +312,7 @@ class SVGStylesheet:
             )
 
         self.drawing_class = class_
+        self.used_classes = used_classes
         self.builder = StyleBuilder(class_)
         self.create()
 
@@ -308,7 +323,7 @@ class SVGStylesheet:
 
     def create(self) -> None:
         """Generate a stylesheet for the given drawing."""
-        self.builder.write_styles()
+        self.builder.write_styles(self.used_classes)
         self.static_deco = STATIC_DECORATIONS[
             "__GLOBAL__"
         ] + STATIC_DECORATIONS.get(self.drawing_class or "", ())
@@ -361,8 +376,12 @@ class StyleBuilder:
         self.gradients: dict[str, str | tuple[str, ...]] = {}
         self.create()
 
-    def write_styles(self) -> None:
-        """Write edge and box styles to sheet."""
+    def write_styles(self, used_classes: cabc.Set[str] | None = None) -> None:
+        """Write edge and box styles to sheet.
+
+        If ``used_classes`` is given, styles for element classes that
+        are not in it are skipped.
+        """
         for key, styles in self.styles.items():
             if not styles:  # pragma: no cover
                 continue
@@ -374,6 +393,12 @@ class StyleBuilder:
             elmtype, elmclass, pseudoclass = elmtype_match.groups()
             if elmtype not in self.stylewriters:
                 continue
+            if (
+                elmclass
+                and used_classes is not None
+                and elmclass[1:] not in used_classes
+            ):
+                continue
             write_styles_real = self.stylewriters[elmtype]
             write_styles_real(elmclass or "", pseudoclass or "", styles)
 
@@ -568,3 +593,13 @@ def deep_update_dict(
 
 
 deep_update_dict.delete = object()  # type: ignore
+
+
+@functools.lru_cache(maxsize=4096)
+def _generate_id(name: str, value: tuple[str | diagram.RGB, ...]) -> str:
+    return "_".join(
+        itertools.chain(
+            (name,),
+            (diagram.RGB.fromcss(v).tohex() for v in value),
+        ),
+    )
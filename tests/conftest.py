@@ -5,9 +5,11 @@
 import collections.abc as cabc
 import io
 import pathlib
+import shutil
 import sys
 
 import pytest
+from lxml import etree
 
 import capellambse
 
@@ -47,3 +49,54 @@ def model_5_2(monkeypatch) -> capellambse.MelodyModel:
     """Return the Capella 5.2 test model."""
     monkeypatch.setattr(sys, "stderr", io.StringIO)
     return capellambse.MelodyModel(TEST_ROOT / "5_2" / TEST_MODEL)
+
+
+@pytest.fixture
+def fragmented_model(tmp_path: pathlib.Path) -> capellambse.MelodyModel:
+    """Return the Capella 5.0 test model with a fragment.
+
+    The LA function package is moved into a separate fragment. The
+    model files are written to ``tmp_path``.
+    """
+    shutil.copytree(TEST_ROOT / "5_0", tmp_path, dirs_exist_ok=True)
+    capella = tmp_path / TEST_MODEL.replace(".aird", ".capella")
+    tree = etree.parse(str(capella))
+    xsitype = capellambse.helpers.ATT_XT
+    pkg = next(
+        i
+        for i in tree.iter("ownedFunctionPkg")
+        if i.get(xsitype)
+        == "org.polarsys.capella.core.data.la:LogicalFunctionPkg"
+    )
+    nsname, tag = pkg.get(xsitype).split(":")
+    fragroot = etree.Element(
+        f"{{{tree.getroot().nsmap[nsname]}}}{tag}",
+        {k: v for k, v in pkg.attrib.items() if k != xsitype},
+        nsmap=tree.getroot().nsmap,
+    )
+    fragroot.extend(pkg)
+    (tmp_path / "fragments").mkdir()
+    etree.ElementTree(fragroot).write(
+        str(tmp_path / "fragments" / "la.capellafragment")
+    )
+    placeholder = etree.Element(
+        pkg.tag,
+        {
+            xsitype: pkg.get(xsitype),
+            "href": f"fragments/la.capellafragment#{pkg.get('id')}",
+        },
+    )
+    pkg.getparent().replace(pkg, placeholder)
+    tree.write(str(capella))
+
+    aird = tmp_path / TEST_MODEL
+    resource = "<semanticResources>Melody%20Model%20Test.capella"
+    aird.write_text(
+        aird.read_text().replace(
+            resource,
+            "<semanticResources>fragments/la.capellafragment"
+            "</semanticResources>" + resource,
+            1,
+        )
+    )
+    return capellambse.MelodyModel(aird)
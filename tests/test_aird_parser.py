@@ -92,3 +92,83 @@ def test_airdparser_msm_produces_valid_json_without_error(
 
     generated_json = diagram.DiagramJSONEncoder(indent=4).encode(parsed)
     json.loads(generated_json)
+
+
+def test_diagram_looks_up_elements_by_uuid() -> None:
+    boxes = [
+        diagram.Box((0, 0), (10, 10), uuid="first"),
+        diagram.Box((20, 0), (10, 10), uuid="second"),
+        diagram.Box((40, 0), (10, 10)),
+    ]
+    dg = diagram.Diagram(elements=boxes)
+
+    assert dg["second"] is boxes[1]
+    assert "first" in dg
+    assert "third" not in dg
+    assert all(i in dg for i in boxes)
+    assert diagram.Box((0, 0), (10, 10), uuid="first") not in dg
+    with pytest.raises(KeyError):
+        dg["third"]
+    with pytest.raises(ValueError):
+        dg.add_element(diagram.Box((0, 0), (10, 10), uuid="first"))
+
+
+def test_diagram_force_overwrites_hidden_elements_in_uuid_index() -> None:
+    hidden = diagram.Box((0, 0), (10, 10), uuid="box", hidden=True)
+    visible = diagram.Box((0, 0), (10, 10), uuid="box")
+    dg = diagram.Diagram(elements=[hidden])
+
+    dg.add_element(visible, force=True)
+
+    assert dg["box"] is visible
+    assert hidden not in dg
+    assert list(dg) == [visible]
+
+
+def test_diagram_crop_keeps_intersecting_elements_and_parents() -> None:
+    parent = diagram.Box((0, 0), (1000, 100), uuid="parent")
+    port = diagram.Box((990, 40), (10, 10), uuid="port", parent=parent)
+    far = diagram.Box((2000, 2000), (10, 10), uuid="far")
+    edge = diagram.Edge([(0, 500), (900, 500)], uuid="edge")
+    dg = diagram.Diagram(elements=[parent, port, far, edge])
+
+    cropped = dg.crop(diagram.Box((950, 0), (100, 100)))
+
+    assert list(cropped) == [parent, port]
+    assert cropped.viewport is not None
+    assert cropped.viewport.pos == (950, 0)
+    assert cropped.viewport.size == (100, 100)
+    assert list(dg.crop(diagram.Box((500, 450), (10, 100)))) == [edge]
+    assert list(dg.crop(diagram.Box((-5000, -5000), (1, 1)))) == []
+
+
+def test_diagram_crop_keeps_all_ancestors_of_nested_elements() -> None:
+    outer = diagram.Box((0, 0), (100, 100), uuid="outer")
+    middle = diagram.Box(
+        (95, 10), (10, 40), uuid="middle", parent=outer, port=True
+    )
+    dg = diagram.Diagram(elements=[outer, middle])
+    dg.crop(diagram.Box((0, 0), (10, 10)))
+    leaf = diagram.Box(
+        (100, 20), (10, 10), uuid="leaf", parent=middle, port=True
+    )
+    dg.add_element(leaf)
+
+    cropped = dg.crop(diagram.Box((103, 25), (0.5, 0.5)))
+
+    assert list(cropped) == [outer, middle, leaf]
+
+
+def test_diagram_crop_renders_a_region_of_a_model_diagram(
+    model: capellambse.MelodyModel,
+) -> None:
+    dg = model.diagrams.by_name("[LAB] Wizzard Education").render(None)
+    assert dg.viewport is not None
+    region = diagram.Box(dg.viewport.pos, dg.viewport.size / 2)
+
+    cropped = dg.crop(region)
+    svg = capellambse.svg.SVGDiagram.from_diagram(cropped).to_string()
+
+    assert 0 < len(cropped) < len(dg)
+    assert all(elm in dg for elm in cropped)
+    assert svg.startswith("<svg")
@@ -69,6 +69,21 @@ class TestDumpLoad:
 
         assert actual == expected
 
+    @staticmethod
+    def test_constructors_added_to_the_loader_are_used(
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setitem(
+            decl.YDMLoader.yaml_constructors,
+            "!answer",
+            lambda loader, node: 42,
+        )
+        yaml = "- parent: !answer ''\n"
+
+        actual = decl.load(io.StringIO(yaml))
+
+        assert actual == [{"parent": 42}]
+
 
 class TestApplyExtend:
     @staticmethod
@@ -545,10 +560,83 @@ class TestApplyDelete:
 
         assert len(root_function.functions) == 0
 
+    @staticmethod
+    @pytest.mark.parametrize("transactional", [False, True])
+    def test_deleting_objects_that_are_not_in_the_list_is_an_error(
+        model: capellambse.MelodyModel, transactional: bool
+    ) -> None:
+        yml = f"""\
+            - parent: !uuid {ROOT_FUNCTION}
+              delete:
+                functions:
+                  - !uuid {ROOT_COMPONENT}
+            """
+
+        with pytest.raises(ValueError, match="No object with UUID"):
+            decl.apply(model, io.StringIO(yml), transactional=transactional)
+
+
+class TestApplyTransactional:
+    @staticmethod
+    def test_new_objects_are_indexed_after_the_transaction(
+        model: capellambse.MelodyModel,
+    ) -> None:
+        yml = f"""\
+            - parent: !uuid {ROOT_FUNCTION}
+              extend:
+                functions:
+                  - name: brew coffee
+                  - name: grind beans
+            - parent: !uuid {ROOT_COMPONENT}
+              extend:
+                allocated_functions:
+                  - !uuid {ROOT_FUNCTION}
+            """
+
+        decl.apply(model, io.StringIO(yml), transactional=True)
+
+        names = {i.name for i in model.search("LogicalFunction")}
+        assert {"brew coffee", "grind beans"} <= names
+        root_function = model.by_uuid(ROOT_FUNCTION)
+        root_component = model.by_uuid(ROOT_COMPONENT)
+        assert root_function in root_component.allocated_functions
+        new_function = root_function.functions.by_name("brew coffee")
+        assert model.by_uuid(new_function.uuid) == new_function
+
+    @staticmethod
+    def test_errors_roll_back_all_changes(
+        model: capellambse.MelodyModel,
+    ) -> None:
+        yml = f"""\
+            - parent: !uuid {ROOT_FUNCTION}
+              extend:
+                functions:
+                  - name: brew coffee
+              modify:
+                name: Coffee machine
+            - parent: !uuid {ROOT_COMPONENT}
+              extend:
+                allocated_functions:
+                  - !promise never-created
+            """
+        functions = {i.uuid for i in model.search("LogicalFunction")}
+        old_name = model.by_uuid(ROOT_FUNCTION).name
+
+        with pytest.raises(decl.UnfulfilledPromisesError):
+            decl.apply(model, io.StringIO(yml), transactional=True)
+
+        assert {i.uuid for i in model.search("LogicalFunction")} == functions
+        root_function = model.by_uuid(ROOT_FUNCTION)
+        assert root_function.name == old_name
+        assert "brew coffee" not in root_function.functions.by_name
+
 
+@pytest.mark.parametrize("transactional", [False, True])
 @pytest.mark.parametrize("filename", ["coffee-machine.yml"])
-def test_full_example(model: capellambse.MelodyModel, filename: str):
-    decl.apply(model, DATAPATH / filename)
+def test_full_example(
+    model: capellambse.MelodyModel, filename: str, transactional: bool
+):
+    decl.apply(model, DATAPATH / filename, transactional=transactional)
 
 
 def test_cli_applies_a_yaml_and_saves_the_model_back(tmp_path: pathlib.Path):
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: Copyright DB Netz AG and the capellambse contributors
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from lxml import etree
+
+from capellambse.loader import exs
+
+from .conftest import TEST_MODEL, TEST_ROOT  # type: ignore[import]
+
+
+class _ChunkRecorder:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, chunk: bytes) -> int:
+        self.chunks.append(chunk)
+        return len(chunk)
+
+
+@pytest.mark.parametrize("line_length", [exs.LINE_LENGTH, 2**31])
+def test_write_streams_the_same_bytes_as_serialize(
+    monkeypatch: pytest.MonkeyPatch, line_length: int
+) -> None:
+    monkeypatch.setattr(exs, "CHUNK_SIZE", 4096)
+    tree = etree.parse(str(TEST_ROOT / "5_0" / TEST_MODEL))
+    expected = b'<?xml version="1.0" encoding="UTF-8"?>' + exs.LINESEP
+    expected += exs.serialize(tree, line_length=line_length)
+    file = _ChunkRecorder()
+
+    exs.write(tree.getroot(), file, line_length=line_length, siblings=True)
+
+    assert b"".join(file.chunks) == expected
+    assert len(file.chunks) > 1
+
+
+def test_to_bytes_declares_namespaces_only_where_they_are_introduced():
+    root = etree.fromstring(
+        '<a xmlns:x="urn:x"><b x:attr="1"><c xmlns:y="urn:y" y:attr="2"/>'
+        "</b></a>"
+    )
+
+    actual = exs.to_bytes(root[0], declare_encoding=False)
+
+    assert actual == (
+        b'<b x:attr="1">'
+        + exs.LINESEP
+        + b'  <c xmlns:y="urn:y" y:attr="2"/>'
+        + exs.LINESEP
+        + b"</b>\n"
+    )
+
+
+def test_write_accepts_file_objects() -> None:
+    root = etree.fromstring("<a><b/></a>")
+    file = io.BytesIO()
+
+    exs.write(root, file)
+
+    assert file.getvalue() == exs.to_bytes(root)
@@ -93,3 +93,28 @@ def test_flatten_html_formats_unordered_lists(
     input: str, expected: str
 ) -> None:
     assert helpers.flatten_html_string(input) == expected
+
+
+@pytest.mark.parametrize("width", [60, 120, 200])
+def test_word_wrap_fills_each_line_as_far_as_possible(width: int) -> None:
+    text = "The quick brown fox jumps over the lazy dog " * 3
+
+    lines = helpers.word_wrap(text, width)
+
+    assert " ".join(lines).split() == text.split()
+    for line, nextline in zip(lines, lines[1:]):
+        nextword = nextline.split()[0]
+        assert helpers.extent_func(line)[0] <= width
+        assert helpers.extent_func(f"{line} {nextword}")[0] > width
+
+
+def test_word_wrap_breaks_words_that_are_too_long_for_a_line() -> None:
+    word = "Supercalifragilisticexpialidocious"
+
+    lines = helpers.word_wrap(word, 30)
+
+    assert len(lines) > 1
+    assert "".join(lines) == word
+    for line, nextline in zip(lines, lines[1:]):
+        assert helpers.extent_func(line)[0] <= 30
+        assert helpers.extent_func(line + nextline[0])[0] > 30
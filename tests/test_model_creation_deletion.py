@@ -4,6 +4,7 @@
 """Tests for creating and deleting model elements."""
 # pylint: disable=missing-function-docstring, redefined-outer-name
 import pathlib
+import shutil
 
 import pytest
 
@@ -52,6 +53,18 @@ def test_created_elements_show_up_in_xml_after_adding_them(
     ), "Cannot find added element via XPath"
 
 
+def test_created_elements_follow_their_predecessor_in_xml(
+    model: capellambse.MelodyModel,
+):
+    component = model.la.root_component
+    first = component.ports.create(name="First")
+    second = component.ports.create(name="Second")
+
+    assert first._element.getnext() is second._element
+    assert list(component.ports) == [first, second]
+    assert model.by_uuid(second.uuid) == second
+
+
 @pytest.mark.parametrize(
     "deletion_target",
     [0, slice(None, 1)],
@@ -177,3 +190,115 @@ def test_deleting_an_object_purges_references_to_children(
     assert not list(model50.find_references(port))
     assert model50.by_uuid(exchange_id).target is None
     assert not caplog.records
+
+
+def test_find_references_sees_links_created_after_the_first_search(
+    model: capellambse.MelodyModel,
+) -> None:
+    part = model.by_uuid("1bd59e23-3d45-4e39-88b4-33a11c56d4e3")
+    component = model.la.root_component.components.create(name="Target")
+    assert not any(
+        obj == part for obj, _, _ in model.find_references(component)
+    )
+
+    part.type = component
+
+    assert (part, "type", None) in list(model.find_references(component))
+
+
+def test_ReferenceSearchingAccessor_sees_changed_references(
+    model: capellambse.MelodyModel,
+) -> None:
+    part = model.by_uuid("1bd59e23-3d45-4e39-88b4-33a11c56d4e3")
+    old_type = part.type
+    component = model.la.root_component.components.create(name="Target")
+    assert part in old_type.parts
+    assert not component.parts
+
+    part.type = component
+
+    assert part not in old_type.parts
+    assert component.parts == [part]
+
+
+def test_ReferenceSearchingAccessor_sees_links_written_through_lists(
+    model50: capellambse.MelodyModel,
+) -> None:
+    item = model50.by_uuid("8f8ba7de-a7e6-4b5c-bd5d-11fba313b444")
+    exchange = model50.by_uuid("c31491db-817d-44b3-a27c-67e9cc1e06a2")
+    assert exchange not in item.exchanges
+
+    exchange.allocated_exchange_items.append(item)
+
+    assert exchange in item.exchanges
+    assert len(item.exchanges) == 2
+
+    exchange.allocated_exchange_items.remove(item)
+
+    assert exchange not in item.exchanges
+    assert len(item.exchanges) == 1
+
+
+def test_resolved_proxy_classes_are_forgotten_after_model_changes(
+    model: capellambse.MelodyModel,
+) -> None:
+    root = model.la.root_component
+    c.GenericElement.from_model(model, root._element)
+    generation, classes = model._class_cache
+    assert classes.get(root._element) is metamodel.la.LogicalComponent
+
+    newobj = root.components.create(name="TestComponent")
+    wrapped = c.GenericElement.from_model(model, newobj._element)
+
+    assert isinstance(wrapped, metamodel.la.LogicalComponent)
+    assert model._class_cache[0] != generation
+    assert root._element not in model._class_cache[1]
+
+
+def test_save_only_writes_modified_fragments(tmp_path: pathlib.Path) -> None:
+    shutil.copytree(TEST_ROOT, tmp_path, dirs_exist_ok=True)
+    model = capellambse.MelodyModel(tmp_path / TEST_MODEL)
+    aird_mtime = (tmp_path / TEST_MODEL).stat().st_mtime_ns
+    assert model.save() == [], "Unmodified model wrote fragments"
+
+    model.la.root_component.name = "Renamed"
+    written = model.save()
+
+    assert written == [pathlib.PurePosixPath("WriteTestModel.capella")]
+    assert (tmp_path / TEST_MODEL).stat().st_mtime_ns == aird_mtime
+    assert model.save() == []
+    reloaded = capellambse.MelodyModel(tmp_path / TEST_MODEL)
+    assert reloaded.la.root_component.name == "Renamed"
+
+
+def test_list_modifications_mark_fragments_as_modified(
+    model: capellambse.MelodyModel,
+) -> None:
+    comps = model.la.root_component.components
+
+    del comps[0]
+
+    assert [
+        i.filename.name for i in model._loader.trees.values() if i.dirty
+    ] == ["WriteTestModel.capella"]
+
+
+def test_deleting_an_object_marks_referencing_fragments_as_modified(
+    fragmented_model: capellambse.MelodyModel, tmp_path: pathlib.Path
+) -> None:
+    uuid = "478417d6-b867-4dfe-8640-961d9d532a79"
+    function = fragmented_model.by_uuid(uuid)
+    component = fragmented_model.la.all_components.by_name("Middle")
+    assert function in component.allocated_functions
+    for tree in fragmented_model._loader.trees.values():
+        tree.dirty = False
+
+    function.parent.functions.remove(function)
+    written = fragmented_model.save()
+
+    assert pathlib.PurePosixPath("Melody Model Test.capella") in written
+    capella = tmp_path / "Melody Model Test.capella"
+    assert f"#{uuid}" not in capella.read_text(encoding="utf-8")
+    reloaded = capellambse.MelodyModel(tmp_path / "Melody Model Test.aird")
+    component = reloaded.la.all_components.by_name("Middle")
+    assert uuid not in [i.uuid for i in component.allocated_functions]
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import math
 import operator
+import os
+import pathlib
 import typing as t
 
 import markupsafe
@@ -11,6 +13,7 @@ import pytest
 
 import capellambse
 import capellambse.model.common as c
+from capellambse import _render_cache
 from capellambse.model import MelodyModel, la, modeltypes
 from capellambse.model.crosslayer.capellacommon import (
     Region,
@@ -120,6 +123,33 @@ def test_ElementList_filter_contains(model: MelodyModel):
     assert "LogicalComponent" not in involvements.by_type
 
 
+def test_ElementList_filters_notice_renamed_elements(model: MelodyModel):
+    caps = model.oa.all_capabilities
+    cap = caps.by_name("Eat food")
+    others = [i for i in caps if i.name != "Eat food"]
+    assert list(caps.exclude_names("Eat food")) == others
+
+    cap.name = "Eat more food"
+
+    assert "Eat food" not in caps.by_name
+    assert caps.by_name("Eat more food") == cap
+    assert list(caps.exclude_names("Eat more food")) == others
+
+
+def test_ElementList_filters_notice_changed_links(model: MelodyModel):
+    parts = model.search("Part")
+    part = model.by_uuid("d3838d2a-7873-4ee2-ad79-d0e2963d683b")
+    weather = model.by_uuid("4bf0356c-89dd-45e9-b8a6-e0332c026d33")
+    by_type_name = parts._Filter(parts, "type.name")
+    assert parts.index(part) in by_type_name.find_indices(("Environment",))
+
+    part._element.set("abstractType", f"#{weather.uuid}")
+    model._loader.mark_dirty(part._element)
+
+    assert parts.index(part) not in by_type_name.find_indices(("Environment",))
+    assert parts.index(part) in by_type_name.find_indices(("Weather",))
+
+
 def test_ElementList_filter_iter(model: MelodyModel):
     caps = model.oa.all_capabilities
     assert sorted(i.name for i in caps) == sorted(caps.by_name)
@@ -181,12 +211,26 @@ def test_GenericElement_attrs(model: MelodyModel, key: str, value: str):
     assert getattr(elm, key) == value
 
 
+def test_GenericElement_proxies_are_reused(model: MelodyModel):
+    elm = model.oa.all_capabilities.by_name("Eat food")
+
+    assert model.by_uuid(elm.uuid) is elm
+    assert c.GenericElement.from_model(model, elm._element) is elm
+
+
 def test_GenericElement_has_diagrams(model: MelodyModel):
     elm = model.oa.all_capabilities.by_name("Eat food")
     assert hasattr(elm, "diagrams")
     assert len(elm.diagrams) == 0
 
 
+def test_GenericElement_diagrams_match_diagram_targets(model: MelodyModel):
+    for diag in model.diagrams:
+        expected = model.diagrams.by_target_uuid(diag.target.uuid)
+        assert list(diag.target.diagrams) == list(expected)
+        assert diag in diag.target.diagrams
+
+
 def test_GenericElement_has_pvmt(model: MelodyModel):
     elm = model.oa.all_capabilities.by_name("Eat food")
 
@@ -638,6 +682,60 @@ def test_model_search_below_filters_elements_by_ancestor(
     assert actual == expected
 
 
+def test_model_search_returns_elements_in_document_order(
+    session_shared_model: capellambse.MelodyModel,
+):
+    root = session_shared_model.la._element
+    expected = [
+        i.get("id")
+        for i in root.iter()
+        if capellambse.helpers.xtype_of(i)
+        in {
+            "org.polarsys.capella.core.data.la:LogicalComponent",
+            "org.polarsys.capella.core.data.la:LogicalFunction",
+        }
+    ]
+
+    found = session_shared_model.search(
+        "LogicalComponent", "LogicalFunction", below=session_shared_model.la
+    )
+
+    assert [i.uuid for i in found] == expected
+
+
+def test_model_search_orders_and_filters_across_fragments(
+    session_shared_model: capellambse.MelodyModel,
+    fragmented_model: capellambse.MelodyModel,
+    caplog: pytest.LogCaptureFixture,
+):
+    xtypes = ("LogicalComponent", "LogicalFunction", "PhysicalComponent")
+    assert len(fragmented_model._loader.trees) == 4
+    expected = [i.uuid for i in session_shared_model.search(*xtypes)]
+    expected_below = [
+        i.uuid
+        for i in session_shared_model.search(
+            "LogicalFunction", below=session_shared_model.la
+        )
+    ]
+
+    found = fragmented_model.search(*xtypes)
+    found_below = fragmented_model.search(
+        "LogicalFunction", below=fragmented_model.la
+    )
+
+    assert [i.uuid for i in found] == expected
+    assert [i.uuid for i in found_below] == expected_below
+    assert expected_below
+
+    fragmented_model.la.root_component.components.create(name="New")
+    with caplog.at_level("DEBUG", logger="capellambse.loader.core"):
+        fragmented_model.search(*xtypes)
+    renumbered = [
+        i.args[0] for i in caplog.records if i.msg.startswith("Numbering")
+    ]
+    assert [i.name for i in renumbered] == ["Melody Model Test.capella"]
+
+
 @pytest.mark.parametrize(
     "xtype",
     {i for map in c.XTYPE_HANDLERS.values() for i in map.values()},
@@ -1146,6 +1244,117 @@ def test_diagram_without_documentation_has_None_description(
     assert actual == expected
 
 
+@pytest.mark.parametrize("workers", [0, 2])
+def test_diagrams_render_all_writes_each_diagram_to_the_sink(
+    model: capellambse.MelodyModel, tmp_path: pathlib.Path, workers: int
+) -> None:
+    diagrams = model.diagrams.by_name(
+        "[MSM] States of Functional Human Being", "[CDB] Data", single=False
+    )
+    assert len(diagrams) == 2
+
+    results = diagrams.render_all("svg", tmp_path, workers=workers)
+
+    assert [i.uuid for i in results] == [i.uuid for i in diagrams]
+    for result in results:
+        assert result.error is None
+        assert result.duration > 0
+        assert result.result == tmp_path / f"{result.uuid}.svg"
+        assert result.result.read_text().startswith("<svg")
+
+
+def test_diagrams_are_served_from_the_render_cache_in_new_models(
+    tmp_path: pathlib.Path,
+) -> None:
+    model = capellambse.MelodyModel(TEST_ROOT / "5_0" / TEST_MODEL)
+    expected = model.diagrams.by_name("[CDB] Data").render("svg")
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, render_cache=tmp_path
+    )
+    model.diagrams.by_name("[CDB] Data").render("svg")
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, render_cache=tmp_path
+    )
+    diag = model.diagrams.by_name("[CDB] Data")
+
+    actual = diag.render("svg")
+
+    assert actual == expected
+    assert not hasattr(diag, "_render")
+
+
+def test_render_cache_notices_changes_to_the_shown_elements(
+    tmp_path: pathlib.Path,
+) -> None:
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, render_cache=tmp_path
+    )
+    diag = model.diagrams.by_name("[CDB] Data")
+    assert "Renamed" not in diag.render("svg")
+
+    diag.nodes[0].name = "Renamed"
+
+    assert "Renamed" in diag.render("svg")
+
+
+def test_render_cache_notices_changes_to_types_of_shown_attributes(
+    tmp_path: pathlib.Path,
+) -> None:
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_2" / TEST_MODEL, render_cache=tmp_path
+    )
+    diag = model.diagrams.by_name("[CDB] Harry's Wand")
+    assert "Renamed" not in diag.render("svg")
+    string_type = model.by_uuid("b2f035e6-78c8-4dfd-99f0-bf4a40ea3e81")
+    assert string_type.uuid not in {i.uuid for i in diag.nodes}
+
+    string_type.name = "Renamed"
+
+    assert "Renamed" in diag.render("svg")
+
+
+def test_render_cache_keys_are_reused_until_the_model_changes(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, render_cache=tmp_path
+    )
+    diag = model.diagrams.by_name("[CDB] Data")
+    calls: list[str] = []
+    original = _render_cache.diagram_key
+
+    def diagram_key(*args: t.Any) -> str:
+        calls.append(args[2])
+        return original(*args)
+
+    monkeypatch.setattr(_render_cache, "diagram_key", diagram_key)
+    diag.render("svg")
+    diag.render("svg")
+    assert calls == ["svg"]
+
+    diag.nodes[0].name = "Renamed"
+
+    assert "Renamed" in diag.render("svg")
+    assert calls == ["svg", "svg"]
+
+
+def test_render_cache_evicts_least_recently_used_entries(
+    tmp_path: pathlib.Path,
+) -> None:
+    cache = _render_cache.RenderCache(tmp_path, max_size=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", b"y" * 10)
+    assert cache.get("a") == "x" * 10
+    os.utime(tmp_path / "b.bin", (0, 0))
+
+    cache.put("c", markupsafe.Markup("z" * 10))
+
+    assert cache.get("a") == "x" * 10
+    with pytest.raises(KeyError):
+        cache.get("b")
+    assert isinstance(cache.get("c"), markupsafe.Markup)
+
+
 def test_lists_of_links_appear_to_contain_target_objects(
     model: capellambse.MelodyModel,
 ):
@@ -5,17 +5,25 @@
 from __future__ import annotations
 
 import base64
+import http.server
+import json
 import pathlib
 import re
 import shutil
+import subprocess
 import sys
+import threading
+import typing as t
 from importlib import metadata
 
 import pytest
 import requests_mock
+from lxml import etree
 
 import capellambse
+from capellambse import _render_cache
 from capellambse.filehandler import gitlab_artifacts
+from capellambse.loader import core as loader_core
 
 # pylint: disable-next=relative-beyond-top-level, useless-suppression
 from .conftest import TEST_MODEL, TEST_ROOT  # type: ignore[import]
@@ -47,6 +55,33 @@ def test_model_loading_via_GitFileHandler():
     )
 
 
+def test_GitFileHandler_reads_files_through_batch_processes(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    handler = capellambse.get_filehandler("git+" + pathlib.Path.cwd().as_uri())
+    folder = pathlib.PurePosixPath("tests/data/melodymodel/5_0")
+    names = [folder / TEST_MODEL, (folder / TEST_MODEL).with_suffix(".afm")]
+    commands: list[list[str]] = []
+    real_run = subprocess.run
+
+    def run(cmd, *args, **kw):
+        commands.append(cmd)
+        return real_run(cmd, *args, **kw)
+
+    monkeypatch.setattr(subprocess, "run", run)
+
+    handler.prefetch(names)
+    for name in names:
+        with handler.open(name) as f:
+            assert f.read() == pathlib.Path(name).read_bytes()
+    with handler.open(names[0]) as f:
+        assert f.read() == pathlib.Path(names[0]).read_bytes()
+    with pytest.raises(FileNotFoundError):
+        handler.open(folder / "Missing.aird")
+
+    assert [i[1] for i in commands] == ["check-attr", "cat-file"]
+
+
 def test_model_loading_from_badpath_raises_FileNotFoundError():
     badpath = TEST_ROOT / "Missing.aird"
     with pytest.raises(FileNotFoundError):
@@ -243,6 +278,61 @@ def test_http_file_handlers_passed_through_custom_headers(
     assert endpoint.called_once
 
 
+@pytest.fixture
+def http_server(tmp_path: pathlib.Path):
+    root = tmp_path / "srv"
+    root.mkdir()
+    statuses: list[tuple[str, int]] = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kw):
+            super().__init__(*args, directory=str(root), **kw)
+
+        def log_request(self, code="-", size="-"):
+            statuses.append((self.path, int(code)))
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", root, statuses
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_file_handler_prefetches_and_revalidates_cached_files(
+    http_server, tmp_path: pathlib.Path
+) -> None:
+    url, root, statuses = http_server
+    names = [f"fragments/frag{i}.capellafragment" for i in range(5)]
+    (root / "fragments").mkdir()
+    for name in names:
+        (root / name).write_bytes(name.encode("ascii"))
+    cache = tmp_path / "cache"
+
+    cold = capellambse.get_filehandler(url, cache_dir=cache)
+    cold.prefetch([*names, "missing.aird"])
+    statuses_after_prefetch = sorted(statuses)
+    for name in names:
+        with cold.open(name) as f:
+            assert f.read() == name.encode("ascii")
+    with pytest.raises(FileNotFoundError):
+        cold.open("missing.aird")
+    warm = capellambse.get_filehandler(url, cache_dir=cache)
+    statuses.clear()
+    with warm.open(names[0]) as f:
+        assert f.read() == names[0].encode("ascii")
+
+    assert statuses_after_prefetch == sorted(
+        [(f"/{i}", 200) for i in names] + [("/missing.aird", 404)]
+    )
+    assert statuses == [(f"/{names[0]}", 304)]
+
+
 def test_gitlab_artifacts_handler_uses_public_gitlab_when_no_hostname_given(
     requests_mock: requests_mock.Mocker,  # pylint: disable=unused-argument
 ) -> None:
@@ -447,3 +537,249 @@ def test_model_info_contains_viewpoints_and_capella_version() -> None:
     assert hasattr(info, "viewpoints")
     assert info.viewpoints["org.polarsys.capella.core.viewpoint"] == "5.0.0"
     assert info.capella_version == "5.0.0"
+
+
+def test_MelodyLoader_uuid_index_tracks_added_and_removed_elements() -> None:
+    loader = capellambse.loader.MelodyLoader(TEST_MODEL_5_0)
+    parent = next(loader.iterall("ownedLogicalComponents"))
+
+    with loader.new_uuid(parent) as new_id:
+        child = parent.makeelement("ownedLogicalComponents", id=new_id)
+        parent.append(child)
+        loader.idcache_index(child)
+
+    assert loader[new_id] is child
+    assert loader.follow_link(None, f"#{new_id}") is child
+
+    loader.idcache_remove(child)
+    parent.remove(child)
+
+    with pytest.raises(KeyError):
+        loader[new_id]  # pylint: disable=pointless-statement
+
+
+def test_MelodyLoader_forgets_duplicate_uuids_once_they_are_removed() -> None:
+    loader = capellambse.loader.MelodyLoader(TEST_MODEL_5_0)
+    target = next(loader.iterall("ownedLogicalComponents"))
+    target_id = target.get("id")
+    aird = next(v for k, v in loader.trees.items() if k.suffix == ".aird")
+    duplicate = aird.root.makeelement("duplicate", uid=target_id)
+    aird.root.append(duplicate)
+    loader.idcache_index(duplicate)
+    dups = loader._MelodyLoader__uuiddups  # type: ignore[attr-defined]
+    assert target_id in dups, "Precondition failed"
+
+    loader.idcache_remove(duplicate)
+    aird.root.remove(duplicate)
+
+    assert target_id not in loader._MelodyLoader__uuiddups  # type: ignore
+    assert loader.follow_link(None, f"#{target_id}") is target
+
+
+def test_MelodyLoader_transaction_only_copies_modified_fragments(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    loader = capellambse.loader.MelodyLoader(TEST_MODEL_5_0)
+    roots = {name: tree.root for name, tree in loader.trees.items()}
+    copied: list[t.Any] = []
+    deepcopy = loader_core.copy.deepcopy
+
+    def spy(obj: t.Any, *args: t.Any) -> t.Any:
+        copied.append(obj)
+        return deepcopy(obj, *args)
+
+    monkeypatch.setattr(loader_core.copy, "deepcopy", spy)
+    parent = next(loader.iterall("ownedLogicalComponents"))
+    semantic = loader.find_fragment(parent)
+
+    with pytest.raises(RuntimeError), loader.transaction():
+        with loader.new_uuid(parent) as new_id:
+            child = parent.makeelement("ownedLogicalComponents", id=new_id)
+            parent.append(child)
+            loader.idcache_index(child)
+        loader.mark_dirty(parent)
+        parent.set("name", "Modified")
+        raise RuntimeError("abort")
+
+    monkeypatch.undo()
+    assert len(copied) == 1
+    with pytest.raises(KeyError):
+        loader[new_id]  # pylint: disable=pointless-statement
+    restored = loader[parent.get("id")]
+    assert restored.get("name") != "Modified"
+    assert len(restored) == len(parent) - 1
+    for name, tree in loader.trees.items():
+        assert (tree.root is roots[name]) == (name != semantic)
+
+
+def test_MelodyLoader_find_fragment_follows_replaced_roots() -> None:
+    loader = capellambse.loader.MelodyLoader(TEST_MODEL_5_0)
+    fragment = next(i for i in loader.trees if i.suffix == ".capella")
+    elem = next(loader.iterall("ownedLogicalComponents"))
+    assert loader.find_fragment(elem) == fragment
+
+    loader.trees[fragment].add_namespace("test", "https://example.com/test")
+    assert loader.find_fragment(elem) == fragment
+
+    parent = elem.getparent()
+    assert parent is not None
+    parent.remove(elem)
+    with pytest.raises(ValueError):
+        loader.find_fragment(elem)
+
+
+def test_MelodyLoader_find_fragment_misses_do_not_rebuild_the_index() -> None:
+    loader = capellambse.loader.MelodyLoader(TEST_MODEL_5_0)
+    elem = next(loader.iterall("ownedLogicalComponents"))
+    loader.find_fragment(elem)
+    index = loader._MelodyLoader__rootindex  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError):
+        loader.find_fragment(etree.Element("detached"))
+
+    assert loader._MelodyLoader__rootindex is index  # type: ignore
+
+
+def test_parallel_loading_produces_the_same_trees_as_sequential_loading():
+    path = "git+" + pathlib.Path.cwd().as_uri()
+    entrypoint = "tests/data/melodymodel/5_0/Melody Model Test.aird"
+    sequential = capellambse.loader.MelodyLoader(path, entrypoint=entrypoint)
+
+    parallel = capellambse.loader.MelodyLoader(
+        path, entrypoint=entrypoint, load_workers=4
+    )
+
+    assert list(parallel.trees) == list(sequential.trees)
+    for fragment, tree in parallel.trees.items():
+        expected = sequential.trees[fragment].enumerate_uuids()
+        assert tree.enumerate_uuids() == expected
+
+
+def test_index_cache_is_reused_when_reopening_an_unchanged_model(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    cold = capellambse.loader.MelodyLoader(
+        TEST_MODEL_5_0, index_cache=tmp_path
+    )
+    assert len(list(tmp_path.iterdir())) == len(cold.trees)
+
+    def fail(_):
+        raise AssertionError("Index was rebuilt despite cache")
+
+    monkeypatch.setattr(loader_core.ModelFile, "idcache_rebuild", fail)
+    warm = capellambse.loader.MelodyLoader(
+        TEST_MODEL_5_0, index_cache=tmp_path
+    )
+
+    for fragment, tree in warm.trees.items():
+        assert tree.enumerate_uuids() == cold.trees[fragment].enumerate_uuids()
+    xtype = "org.polarsys.capella.core.data.la:LogicalComponent"
+    assert len(list(warm.iterall_xt(xtype))) == len(
+        list(cold.iterall_xt(xtype))
+    )
+    uuid = next(iter(cold.trees[next(iter(cold.trees))].enumerate_uuids()))
+    assert warm[uuid].attrib == cold[uuid].attrib
+
+
+def test_index_cache_is_pruned_to_its_size_limit(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    monkeypatch.setattr(loader_core, "INDEX_CACHE_MAX_SIZE", 0)
+
+    capellambse.loader.MelodyLoader(TEST_MODEL_5_0, index_cache=tmp_path)
+
+    assert list(tmp_path.glob("*.json")) == []
+
+
+FAKE_CAPELLA_CLI = """\
+import json, os, pathlib, sys
+
+log = pathlib.Path(os.environ["FAKE_CAPELLA_LOG"])
+run = len(log.read_text().splitlines()) + 1 if log.exists() else 1
+with log.open("a") as f:
+    f.write(f"{run}\\n")
+
+output = pathlib.Path(sys.argv[sys.argv.index("-import") + 1], "output")
+output.mkdir(parents=True, exist_ok=True)
+names = json.loads(os.environ["FAKE_CAPELLA_NAMES"])
+for name in names:
+    (output / f"{name}.svg").write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        f'<text font-family="Serif">{run}</text></svg>'
+    )
+"""
+
+
+def _install_fake_capella_cli(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    model: capellambse.MelodyModel,
+) -> tuple[pathlib.Path, pathlib.Path]:
+    cli = tmp_path / "capella"
+    cli.write_text(f"#!{sys.executable}\n{FAKE_CAPELLA_CLI}")
+    cli.chmod(0o755)
+    log = tmp_path / "cli.log"
+    monkeypatch.setenv("FAKE_CAPELLA_LOG", str(log))
+    names: list[str] = []
+    counts: dict[str, int] = {}
+    for diag in model.diagrams:
+        count = counts[diag.name] = counts.get(diag.name, 0) + 1
+        names.append(diag.name if count == 1 else f"{diag.name}_{count - 1}")
+    monkeypatch.setenv("FAKE_CAPELLA_NAMES", json.dumps(names))
+    return cli, log
+
+
+def test_incremental_diagram_cache_update_only_exports_changed_diagrams(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "cache"
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, diagram_cache=cache
+    )
+    cli, log = _install_fake_capella_cli(tmp_path, monkeypatch, model)
+
+    def exported_runs() -> dict[str, str]:
+        return {
+            model.diagrams.by_uuid(i.stem)
+            .name: re.sub(r"<[^>]*>", "", i.read_text())
+            .strip()
+            for i in cache.glob("*.svg")
+        }
+
+    model.update_diagram_cache(str(cli), incremental=True)
+    model.update_diagram_cache(str(cli), incremental=True)
+
+    assert log.read_text().split() == ["1"]
+    assert len(exported_runs()) == len(model.diagrams)
+    assert "Open Sans" in next(cache.glob("*.svg")).read_text()
+
+    model.diagrams.by_name("[CDB] Data").target.name = "Renamed"
+    model.update_diagram_cache(str(cli), incremental=True)
+
+    assert log.read_text().split() == ["1", "2"]
+    runs = exported_runs()
+    assert {k for k, v in runs.items() if v == "2"} == {
+        "[CDB] Data",
+        "[CDB] CodeGeneration",
+    }
+    assert len(runs) == len(model.diagrams)
+
+
+def test_full_diagram_cache_update_does_not_fingerprint_diagrams(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "cache"
+    model = capellambse.MelodyModel(
+        TEST_ROOT / "5_0" / TEST_MODEL, diagram_cache=cache
+    )
+    cli, log = _install_fake_capella_cli(tmp_path, monkeypatch, model)
+
+    def fail(*_: t.Any) -> t.NoReturn:
+        raise AssertionError("Diagram was fingerprinted")
+
+    monkeypatch.setattr(_render_cache, "diagram_fingerprint", fail)
+
+    model.update_diagram_cache(str(cli))
+
+    assert log.read_text().split() == ["1"]
+    assert len(list(cache.glob("*.svg"))) == len(model.diagrams)
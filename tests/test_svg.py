@@ -15,6 +15,7 @@ import capellambse
 from capellambse.svg import (
     SVGDiagram,
     decorations,
+    drawing,
     generate,
     helpers,
     style,
@@ -114,6 +115,18 @@ class TestSVG:
         assert cp_unset_exists
         assert cp_reference_exists
 
+    @pytest.mark.parametrize("diagram_name", TEST_DIAGS)
+    def test_diagram_from_diagram_matches_json_round_trip(
+        self, model: capellambse.MelodyModel, diagram_name: str
+    ) -> None:
+        dg = model.diagrams.by_name(diagram_name).render(None)
+        jsondata = capellambse.diagram.DiagramJSONEncoder().encode(dg)
+        expected = SVGDiagram.from_json(jsondata).to_string()
+
+        actual = SVGDiagram.from_diagram(dg).to_string()
+
+        assert actual == expected
+
     @pytest.fixture
     def tmp_svg(self, tmp_path: pathlib.Path) -> SVGDiagram:
         name = "Test svg"
@@ -404,6 +417,31 @@ class TestSVG:
         diag = model.diagrams.by_name(diagram_name)
         diag.render("svg")
 
+    def test_shared_defs_are_only_emitted_once(self) -> None:
+        metadata = generate.DiagramMetadata(
+            pos=(0, 0),
+            size=(10, 10),
+            name="Test",
+            class_="Logical Architecture Blank",
+        )
+        svg = drawing.Drawing(metadata)
+        for _ in range(3):
+            svg._deploy_defs(
+                style.Styling(
+                    metadata.class_,
+                    "Edge.Constraint",
+                    stroke="#ff0000",
+                    fill=["#ff0000", "#ffffff"],
+                )
+            )
+
+        tree = etree.fromstring(svg.to_string())
+        ids = [i.get("id") for i in tree.iterfind("{*}defs/*[@id]")]
+
+        assert len(ids) == len(set(ids))
+        assert "CustomGradient_FF0000_FFFFFF" in ids
+        assert "FineArrowMark_FF0000" in ids
+
 
 class TestSVGStyling:
     LAB = "Logical Architecture Blank"
@@ -419,6 +457,35 @@ class TestSVGStyling:
             for line in str(svg.drawing.stylesheet).splitlines():
                 assert line.startswith(".LogicalArchitectureBlank")
 
+        def test_svg_stylesheet_only_has_styles_for_drawn_classes(
+            self, tmp_json
+        ) -> None:
+            svg = SVGDiagram.from_json_path(tmp_json)
+            full_sheet = str(style.SVGStylesheet(svg.drawing.diagram_class))
+
+            sheet = str(svg.drawing.stylesheet)
+
+            assert "g.Box.LogicalComponent >" in sheet
+            assert "g.Box.Requirement >" in full_sheet
+            assert "g.Box.Requirement >" not in sheet
+            assert "g.Edge.RequirementRelation >" not in sheet
+
+        def test_svg_stylesheet_is_kept_until_new_classes_are_drawn(
+            self, tmp_json
+        ) -> None:
+            svg = SVGDiagram.from_json_path(tmp_json)
+            svg.to_string()
+            stylesheet = svg.drawing.stylesheet
+            assert svg.drawing.stylesheet is stylesheet
+
+            svg.drawing.make_stylesheet()
+
+            assert svg.drawing.stylesheet is not stylesheet
+            tree = etree.fromstring(svg.to_string())
+            sheet = tree.find("{*}defs/{*}style")
+            assert sheet is not None
+            assert sheet.text == str(svg.drawing.stylesheet)
+
         def test_svg_stylesheet_builder_fails_when_no_class_was_given(self):
             expected_error_msg = (
                 "Invalid type for class_ 'NoneType'. This needs to be a str."
@@ -429,6 +496,64 @@ class TestSVGStyling:
 
             assert error.value.args[0] == expected_error_msg
 
+        def test_svg_stylesheets_do_not_share_their_builders(self):
+            first = style.SVGStylesheet("Logical Architecture Blank")
+            second = style.SVGStylesheet("Logical Architecture Blank")
+
+            first.builder.sheet.write("/* first only */\n")
+
+            assert "first only" not in str(second)
+
+    def test_resolved_default_styles_are_not_shared(self):
+        first = capellambse.diagram.get_style(
+            "Logical Architecture Blank", "Box.LogicalComponent"
+        )
+        first["stroke"] = "#f00"
+
+        second = capellambse.diagram.get_style(
+            "Logical Architecture Blank", "Box.LogicalComponent"
+        )
+
+        assert second["stroke"] != "#f00"
+
+    def test_changes_to_the_default_styles_are_picked_up(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        diagclass = "Logical Architecture Blank"
+        capellambse.diagram.get_style(diagclass, "Box.LogicalComponent")
+        monkeypatch.setitem(
+            capellambse.diagram.STYLES[diagclass]["Box.LogicalComponent"],
+            "stroke",
+            capellambse.diagram.RGB(255, 0, 0),
+        )
+
+        actual = capellambse.diagram.get_style(
+            diagclass, "Box.LogicalComponent"
+        )
+
+        assert actual["stroke"] == capellambse.diagram.RGB(255, 0, 0)
+
+    def test_changes_to_replaced_default_styles_are_picked_up(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        diagclass = "Logical Architecture Blank"
+        capellambse.diagram.get_style(diagclass, "Box.LogicalComponent")
+        monkeypatch.setitem(
+            capellambse.diagram.STYLES,
+            diagclass,
+            {"Box.LogicalComponent": {}},
+        )
+        capellambse.diagram.get_style(diagclass, "Box.LogicalComponent")
+
+        capellambse.diagram.STYLES[diagclass]["Box.LogicalComponent"][
+            "stroke"
+        ] = capellambse.diagram.RGB(255, 0, 0)
+        actual = capellambse.diagram.get_style(
+            diagclass, "Box.LogicalComponent"
+        )
+
+        assert actual["stroke"] == capellambse.diagram.RGB(255, 0, 0)
+
     @pytest.mark.parametrize(
         "style_,diagstyle,expected",
         [